@@ -2,11 +2,35 @@
 Advanced technical indicators for comprehensive analysis.
 """
 
-from typing import Dict
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
 import numpy as np
 import pandas as pd
 import talib
 from config import INDICATOR_PARAMS
+from numba_compat import njit, F8_RO, FASTMATH
+
+
+# OHLCV input: a DataFrame, or a dict of per-column float64 arrays built once
+# by the caller (structure-of-arrays) so repeated column lookups skip pandas.
+OHLCV = Union[pd.DataFrame, Dict[str, np.ndarray]]
+
+
+def _arr(data: OHLCV, col: str) -> np.ndarray:
+    """Column as float64 ndarray without copying when it already is float64.
+
+    The result may be a (read-only) view of the input; do not modify it.
+    """
+    return np.asarray(data[col], dtype=np.float64)
+
+
+def _tail(data: OHLCV, col: str, n: int) -> np.ndarray:
+    """Last n rows of a column as float64; the column is sliced before conversion."""
+    c = data[col]
+    c = c.iloc[-n:] if isinstance(c, pd.Series) else c[-n:]
+    return np.asarray(c, dtype=np.float64)
 
 
 def _ema(series: np.ndarray, period: int) -> np.ndarray:
@@ -17,14 +41,218 @@ def _sma(series: np.ndarray, period: int) -> np.ndarray:
     return talib.SMA(series.astype(float), timeperiod=period)
 
 
-def compute_supertrend(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+def _diff(arr: np.ndarray, first: float) -> np.ndarray:
+    """arr[i] - arr[i-1] with `first` in slot 0, written into a single new buffer."""
+    out = np.empty_like(arr)
+    out[:1] = first
+    np.subtract(arr[1:], arr[:-1], out=out[1:])
+    return out
+
+
+@njit(f'void({F8_RO}, {F8_RO}, {F8_RO}, float64[:], float64[:], float64[:])', cache=True, nogil=True, fastmath=FASTMATH)
+def _supertrend_loop(upper_basic, lower_basic, close, upper, lower, trend):
+    """Fill the final SuperTrend bands and direction into the preallocated outputs."""
+    n = close.shape[0]
+    if n == 0:
+        return
+    # Previous bar's state is carried in scalars; each output slot is written once.
+    up_prev = upper_basic[0]
+    lo_prev = lower_basic[0]
+    tr_prev = np.nan
+    upper[0] = up_prev
+    lower[0] = lo_prev
+    trend[0] = tr_prev
+    initialized = False
+
+    for i in range(1, n):
+        ub = upper_basic[i]
+        lb = lower_basic[i]
+        c = close[i]
+        up = ub if math.isnan(up_prev) else (up_prev if up_prev < ub else ub)
+        lo = lb if math.isnan(lo_prev) else (lo_prev if lo_prev > lb else lb)
+
+        if not initialized:
+            # initialize trend with first non-nan
+            tr = 1.0 if c >= up_prev else -1.0
+            initialized = True
+        elif tr_prev == 1.0:
+            if c < lo:
+                tr = -1.0
+                up = ub
+            else:
+                tr = 1.0
+        else:
+            if c > up:
+                tr = 1.0
+                lo = lb
+            else:
+                tr = -1.0
+
+        upper[i] = up
+        lower[i] = lo
+        trend[i] = tr
+        up_prev = up
+        lo_prev = lo
+        tr_prev = tr
+
+
+@njit('UniTuple(float64, 2)(float64, float64, float64)', cache=True, nogil=True, fastmath=FASTMATH)
+def _kahan_add(total, comp, v):
+    """Compensated (Kahan) accumulation, as used by pandas' rolling kernels."""
+    y = v - comp
+    t = total + y
+    return t, (t - total) - y
+
+
+@njit(f'float64[:]({F8_RO}, {F8_RO}, int64, int64)', cache=True, nogil=True, fastmath=FASTMATH, error_model='numpy')
+def _rolling_sum_ratio(num, den, period, min_periods):
+    """rolling(period).sum() of num divided by that of den, in one pass (NaNs skipped)."""
+    n = num.shape[0]
+    out = np.empty(n)
+    s_num = 0.0
+    s_den = 0.0
+    k_num = 0.0
+    k_den = 0.0
+    c_num = 0
+    c_den = 0
+    for i in range(n):
+        v = num[i]
+        if not math.isnan(v):
+            s_num, k_num = _kahan_add(s_num, k_num, v)
+            c_num += 1
+        v = den[i]
+        if not math.isnan(v):
+            s_den, k_den = _kahan_add(s_den, k_den, v)
+            c_den += 1
+        if i >= period:
+            v = num[i - period]
+            if not math.isnan(v):
+                s_num, k_num = _kahan_add(s_num, k_num, -v)
+                c_num -= 1
+            v = den[i - period]
+            if not math.isnan(v):
+                s_den, k_den = _kahan_add(s_den, k_den, -v)
+                c_den -= 1
+        if c_num >= min_periods and c_den >= min_periods and c_num > 0 and c_den > 0:
+            out[i] = s_num / s_den
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(f'float64[:]({F8_RO}, int64, int64)', cache=True, nogil=True, fastmath=FASTMATH)
+def _rolling_mean(x, period, min_periods):
+    """Equivalent of pd.Series(x).rolling(period, min_periods).mean() (NaNs skipped)."""
+    n = x.shape[0]
+    out = np.empty(n)
+    s = 0.0
+    k = 0.0
+    c = 0
+    for i in range(n):
+        v = x[i]
+        if not math.isnan(v):
+            s, k = _kahan_add(s, k, v)
+            c += 1
+        if i >= period:
+            v = x[i - period]
+            if not math.isnan(v):
+                s, k = _kahan_add(s, k, -v)
+                c -= 1
+        if c >= min_periods and c > 0:
+            out[i] = s / c
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(f'UniTuple(float64[:], 2)({F8_RO}, {F8_RO}, int64, int64)', cache=True, nogil=True, fastmath=FASTMATH)
+def _rolling_max_min(high, low, period, min_periods):
+    """Rolling max of high and rolling min of low in O(N) using monotonic deques.
+
+    Same semantics as pandas rolling(period, min_periods).max()/.min():
+    NaNs are skipped and a slot is NaN until the window holds min_periods values.
+    """
+    n = high.shape[0]
+    hh = np.empty(n)
+    ll = np.empty(n)
+    # Ring buffers of candidate indices; never hold more than `period` entries.
+    qmax = np.empty(period, np.int64)
+    qmin = np.empty(period, np.int64)
+    max_head = 0
+    max_len = 0
+    min_head = 0
+    min_len = 0
+    c_high = 0
+    c_low = 0
+
+    for i in range(n):
+        start = i - period + 1
+        if i >= period:
+            if not math.isnan(high[i - period]):
+                c_high -= 1
+            if not math.isnan(low[i - period]):
+                c_low -= 1
+        if max_len > 0 and qmax[max_head] < start:
+            max_head = (max_head + 1) % period
+            max_len -= 1
+        if min_len > 0 and qmin[min_head] < start:
+            min_head = (min_head + 1) % period
+            min_len -= 1
+
+        h = high[i]
+        if not math.isnan(h):
+            c_high += 1
+            while max_len > 0 and high[qmax[(max_head + max_len - 1) % period]] <= h:
+                max_len -= 1
+            qmax[(max_head + max_len) % period] = i
+            max_len += 1
+        l = low[i]
+        if not math.isnan(l):
+            c_low += 1
+            while min_len > 0 and low[qmin[(min_head + min_len - 1) % period]] >= l:
+                min_len -= 1
+            qmin[(min_head + min_len) % period] = i
+            min_len += 1
+
+        hh[i] = high[qmax[max_head]] if c_high >= min_periods and c_high > 0 else np.nan
+        ll[i] = low[qmin[min_head]] if c_low >= min_periods and c_low > 0 else np.nan
+    return hh, ll
+
+
+@njit(f'void(float64[:], {F8_RO}, int64)', cache=True, nogil=True, fastmath=FASTMATH)
+def _warmup_nan(out, x, period):
+    """NaN out the first period-1 slots counted from x's first non-NaN value."""
+    n = x.shape[0]
+    first = 0
+    while first < n and math.isnan(x[first]):
+        first += 1
+    for i in range(min(first + period - 1, n)):
+        out[i] = np.nan
+
+
+@njit(f'float64[:]({F8_RO}, {F8_RO}, int64)', cache=True, nogil=True, fastmath=FASTMATH)
+def _rolling_mid(high, low, period):
+    """(rolling max(high) + rolling min(low)) / 2.
+
+    Matches talib.MAX/MIN on NaN-free input: NaN for the first period-1 bars
+    (counted from the first valid value), the window extreme after that.
+    Interior NaNs are skipped, so a bar is NaN only if its whole window is;
+    talib's own NaN gaps depend on its version and on where the NaN falls.
+    """
+    hh, ll = _rolling_max_min(high, low, period, 1)
+    _warmup_nan(hh, high, period)
+    _warmup_nan(ll, low, period)
+    return (hh + ll) / 2.0
+
+
+def compute_supertrend(data: OHLCV) -> Dict[str, np.ndarray]:
     params = INDICATOR_PARAMS.get('SUPER_TREND', {'atr_period': 10, 'multiplier': 3.0})
     atr_period = params['atr_period']
     mult = float(params['multiplier'])
 
-    high = data['high'].astype(float).values
-    low = data['low'].astype(float).values
-    close = data['close'].astype(float).values
+    high = _arr(data, 'high')
+    low = _arr(data, 'low')
+    close = _arr(data, 'close')
 
     atr = talib.ATR(high, low, close, timeperiod=atr_period)
     # Basic bands
@@ -32,32 +260,12 @@ def compute_supertrend(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     upper_basic = hl2 + mult * atr
     lower_basic = hl2 - mult * atr
 
-    n = len(close)
-    upper = np.copy(upper_basic)
-    lower = np.copy(lower_basic)
-    trend = np.full(n, np.nan)
-
     # Final bands and trend direction
-    for i in range(1, n):
-        upper[i] = min(upper_basic[i], upper[i - 1]) if not np.isnan(upper[i-1]) else upper_basic[i]
-        lower[i] = max(lower_basic[i], lower[i - 1]) if not np.isnan(lower[i-1]) else lower_basic[i]
-
-        if np.isnan(trend[i-1]):
-            # initialize trend with first non-nan
-            trend[i] = 1 if close[i] >= upper[i - 1] else -1
-        else:
-            if trend[i-1] == 1:
-                if close[i] < lower[i]:
-                    trend[i] = -1
-                    upper[i] = upper_basic[i]
-                else:
-                    trend[i] = 1
-            else:
-                if close[i] > upper[i]:
-                    trend[i] = 1
-                    lower[i] = lower_basic[i]
-                else:
-                    trend[i] = -1
+    n = len(close)
+    upper = np.empty(n)
+    lower = np.empty(n)
+    trend = np.empty(n)
+    _supertrend_loop(upper_basic, lower_basic, close, upper, lower, trend)
 
     supertrend = np.where(trend == 1, lower, upper)
 
@@ -69,41 +277,41 @@ def compute_supertrend(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     }
 
 
-def compute_ichimoku(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+def compute_ichimoku(data: OHLCV) -> Dict[str, np.ndarray]:
     p = INDICATOR_PARAMS.get('ICHIMOKU', {'conversion': 9, 'base': 26, 'span_b': 52, 'displacement': 26})
-    high = data['high'].astype(float).values
-    low = data['low'].astype(float).values
-    close = data['close'].astype(float).values
+    high = _arr(data, 'high')
+    low = _arr(data, 'low')
+    close = _arr(data, 'close')
 
     conv = int(p['conversion'])
     base = int(p['base'])
     span_b = int(p['span_b'])
 
-    def rolling_mid(h, l, period):
-        hh = talib.MAX(h, timeperiod=period)
-        ll = talib.MIN(l, timeperiod=period)
-        return (hh + ll) / 2.0
-
-    tenkan = rolling_mid(high, low, conv)
-    kijun = rolling_mid(high, low, base)
+    tenkan = _rolling_mid(high, low, conv)
+    kijun = _rolling_mid(high, low, base)
     senkou_a = (tenkan + kijun) / 2.0
-    senkou_b = rolling_mid(high, low, span_b)
+    senkou_b = _rolling_mid(high, low, span_b)
 
     # shift forward by base periods; fill with nan at beginning to align
     disp = int(p['displacement'])
     def fwd_shift(arr, k):
-        res = np.full_like(arr, np.nan)
         if k <= 0:
             return arr
+        # Only the leading k slots need NaN; the rest is overwritten
+        res = np.empty_like(arr)
+        res[:k] = np.nan
         res[k:] = arr[:-k]
         return res
 
     senkou_a_fwd = fwd_shift(senkou_a, disp)
     senkou_b_fwd = fwd_shift(senkou_b, disp)
-    chikou = np.full_like(close, np.nan)
     # lagging span is close shifted back by base
     if disp > 0:
+        chikou = np.empty_like(close)
         chikou[:-disp] = close[disp:]
+        chikou[-disp:] = np.nan
+    else:
+        chikou = np.full_like(close, np.nan)
 
     return {
         'Ichimoku_Tenkan': tenkan,
@@ -114,13 +322,12 @@ def compute_ichimoku(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     }
 
 
-def compute_donchian(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+def compute_donchian(data: OHLCV) -> Dict[str, np.ndarray]:
     period = int(INDICATOR_PARAMS.get('DONCHIAN', {'period': 20})['period'])
-    high = data['high'].astype(float)
-    low = data['low'].astype(float)
+    high = _arr(data, 'high')
+    low = _arr(data, 'low')
 
-    upper = high.rolling(window=period, min_periods=1).max().values
-    lower = low.rolling(window=period, min_periods=1).min().values
+    upper, lower = _rolling_max_min(high, low, period, 1)
     middle = (upper + lower) / 2.0
     return {
         'Donchian_Upper': upper,
@@ -129,13 +336,13 @@ def compute_donchian(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     }
 
 
-def compute_keltner(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+def compute_keltner(data: OHLCV) -> Dict[str, np.ndarray]:
     p = INDICATOR_PARAMS.get('KELTNER', {'ema_period': 20, 'atr_multiplier': 2.0})
     ema_p = int(p['ema_period'])
     mult = float(p['atr_multiplier'])
-    high = data['high'].astype(float).values
-    low = data['low'].astype(float).values
-    close = data['close'].astype(float).values
+    high = _arr(data, 'high')
+    low = _arr(data, 'low')
+    close = _arr(data, 'close')
     tp = (high + low + close) / 3.0
     ema_tp = talib.EMA(tp, timeperiod=ema_p)
     atr = talib.ATR(high, low, close, timeperiod=ema_p)
@@ -148,32 +355,39 @@ def compute_keltner(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     }
 
 
-def compute_moneyflow(data: pd.DataFrame) -> Dict[str, np.ndarray]:
-    close = data['close'].astype(float).values
-    high = data['high'].astype(float).values
-    low = data['low'].astype(float).values
-    volume = data['volume'].astype(float).values
+def compute_moneyflow(data: OHLCV) -> Dict[str, np.ndarray]:
+    close = _arr(data, 'close')
+    high = _arr(data, 'high')
+    low = _arr(data, 'low')
+    volume = _arr(data, 'volume')
 
     mfi = talib.MFI(high, low, close, volume, timeperiod=int(INDICATOR_PARAMS.get('MFI', {'timeperiod': 14})['timeperiod']))
 
     # Chaikin Money Flow
     period = int(INDICATOR_PARAMS.get('CMF', {'timeperiod': 20})['timeperiod'])
-    mfm = ((close - low) - (high - close)) / np.where((high - low) == 0, 1e-9, (high - low))
-    mfv = mfm * volume
-    cmf = pd.Series(mfv).rolling(window=period, min_periods=1).sum().values / \
-          pd.Series(volume).rolling(window=period, min_periods=1).sum().values
+    hl = high - low
+    # high >= low, so clamping only lifts zero-range bars to the epsilon
+    np.maximum(hl, 1e-9, out=hl)
+    # Money flow volume: ((close - low) - (high - close)) / (high - low) * volume, in one buffer
+    mfv = 2.0 * close
+    mfv -= high
+    mfv -= low
+    mfv /= hl
+    mfv *= volume
+    cmf = _rolling_sum_ratio(mfv, volume, period, 1)
 
     # Ease of Movement
     eom_period = int(INDICATOR_PARAMS.get('EOM', {'timeperiod': 14})['timeperiod'])
     hl_mid = (high + low) / 2.0
-    box_ratio = np.where((high - low) == 0, 1e-9, (high - low)) / volume
-    eom = ((hl_mid[1:] - hl_mid[:-1]) / box_ratio[1:])
-    eom = np.insert(eom, 0, np.nan)
-    eom = pd.Series(eom).rolling(window=eom_period, min_periods=1).mean().values
+    box_ratio = hl / volume
+    eom = _diff(hl_mid, np.nan)
+    eom[1:] /= box_ratio[1:]
+    eom = _rolling_mean(eom, eom_period, 1)
 
     # Force Index
     fi_period = int(INDICATOR_PARAMS.get('FORCE', {'timeperiod': 13})['timeperiod'])
-    force = np.insert((close[1:] - close[:-1]) * volume[1:], 0, 0.0)
+    force = _diff(close, 0.0)
+    force[1:] *= volume[1:]
     force = talib.EMA(force, timeperiod=fi_period)
 
     return {
@@ -184,15 +398,15 @@ def compute_moneyflow(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     }
 
 
-def compute_momentum_extra(data: pd.DataFrame) -> Dict[str, np.ndarray]:
-    close = data['close'].astype(float).values
+def compute_momentum_extra(data: OHLCV) -> Dict[str, np.ndarray]:
+    close = _arr(data, 'close')
     ppo_p = INDICATOR_PARAMS.get('PPO', {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9})
     ppo = talib.PPO(close, fastperiod=int(ppo_p['fastperiod']), slowperiod=int(ppo_p['slowperiod']))
     ppo_signal = talib.EMA(ppo, timeperiod=int(ppo_p['signalperiod']))
 
     # TSI
     tsi_p = INDICATOR_PARAMS.get('TSI', {'long': 25, 'short': 13, 'signal': 7})
-    m = np.insert(close[1:] - close[:-1], 0, 0.0)
+    m = _diff(close, 0.0)
     ema1 = talib.EMA(m, timeperiod=int(tsi_p['long']))
     ema2 = talib.EMA(ema1, timeperiod=int(tsi_p['short']))
     abs_m = np.abs(m)
@@ -205,14 +419,15 @@ def compute_momentum_extra(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     dpo_n = int(INDICATOR_PARAMS.get('DPO', {'timeperiod': 20})['timeperiod'])
     sma = talib.SMA(close, timeperiod=dpo_n)
     shift = int(dpo_n / 2 + 1)
-    sma_shift = np.full_like(close, np.nan)
+    sma_shift = np.empty_like(close)
+    sma_shift[:shift] = np.nan
     sma_shift[shift:] = sma[:-shift]
     dpo = close - sma_shift
 
     # KAMA / DEMA / TEMA
     kama_p = int(INDICATOR_PARAMS.get('KAMA', {'timeperiod': 30})['timeperiod'])
     kama = talib.KAMA(close, timeperiod=kama_p)
-    kama_slope = np.insert(kama[1:] - kama[:-1], 0, 0.0)
+    kama_slope = _diff(kama, 0.0)
     dema = talib.DEMA(close, timeperiod=int(INDICATOR_PARAMS.get('DEMA', {'timeperiod': 20})['timeperiod']))
     tema = talib.TEMA(close, timeperiod=int(INDICATOR_PARAMS.get('TEMA', {'timeperiod': 20})['timeperiod']))
 
@@ -229,9 +444,9 @@ def compute_momentum_extra(data: pd.DataFrame) -> Dict[str, np.ndarray]:
     }
 
 
-def compute_regime_features(data: pd.DataFrame, base_ind: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+def compute_regime_features(data: OHLCV, base_ind: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
     """Pre-compute features used for regime detection and weighting."""
-    close = data['close'].astype(float).values
+    close = _arr(data, 'close')
     res: Dict[str, np.ndarray] = {}
 
     # BB width (percent of middle)
@@ -247,41 +462,38 @@ def compute_regime_features(data: pd.DataFrame, base_ind: Dict[str, np.ndarray])
     return res
 
 
-def compute_vwma(data: pd.DataFrame) -> Dict[str, np.ndarray]:
+def compute_vwma(data: OHLCV) -> Dict[str, np.ndarray]:
     """
     Compute Volume Weighted Moving Average (VWMA).
     Acts as a dynamic support/resistance level that accounts for volume.
     """
     period = int(INDICATOR_PARAMS.get('VWMA', {'period': 20})['period'])
-    close = data['close'].astype(float).values
-    volume = data['volume'].astype(float).values
+    close = _arr(data, 'close')
+    volume = _arr(data, 'volume')
     
     # VWMA = Sum(Price * Volume) / Sum(Volume)
     pv = close * volume
-    
-    vwma = pd.Series(pv).rolling(window=period, min_periods=period).sum() / \
-           pd.Series(volume).rolling(window=period, min_periods=period).sum()
-           
+    vwma = _rolling_sum_ratio(pv, volume, period, period)
+
     return {
-        'VWMA': vwma.values
+        'VWMA': vwma
     }
 
 
-def compute_fibonacci_levels(data: pd.DataFrame) -> Dict[str, float]:
+def compute_fibonacci_levels(data: OHLCV) -> Dict[str, float]:
     """
     Compute dynamic Fibonacci Retracement levels based on recent significant High/Low over a lookback period.
     """
     lookback = int(INDICATOR_PARAMS.get('FIBONACCI', {'lookback': 120})['lookback'])
-    highs = data['high'].astype(float).values
-    lows = data['low'].astype(float).values
-    
-    # Look back 'lookback' days or available data
-    lb = min(len(highs), lookback)
+    # Look back 'lookback' days or available data; only that tail is converted
+    lb = min(len(data['high']), lookback)
     if lb < 2:
         return {}
-        
-    recent_high = np.max(highs[-lb:])
-    recent_low = np.min(lows[-lb:])
+    highs = _tail(data, 'high', lb)
+    lows = _tail(data, 'low', lb)
+
+    recent_high = np.max(highs)
+    recent_low = np.min(lows)
     
     diff = recent_high - recent_low
     
@@ -295,3 +507,32 @@ def compute_fibonacci_levels(data: pd.DataFrame) -> Dict[str, float]:
         'Fib_0.786': recent_high - diff * 0.786,
     }
 
+
+# Per-symbol indicators that depend only on the OHLCV frame
+# (compute_regime_features also needs the base indicators).
+_PER_SYMBOL_FUNCS = (
+    compute_supertrend,
+    compute_ichimoku,
+    compute_donchian,
+    compute_keltner,
+    compute_moneyflow,
+    compute_momentum_extra,
+    compute_vwma,
+    compute_fibonacci_levels,
+)
+
+
+def _compute_per_symbol(data: OHLCV) -> Dict[str, np.ndarray]:
+    res: Dict[str, np.ndarray] = {}
+    for fn in _PER_SYMBOL_FUNCS:
+        res.update(fn(data))
+    return res
+
+
+def compute_indicators_batch(dfs: List[OHLCV], max_workers: Optional[int] = None) -> List[Dict[str, np.ndarray]]:
+    """
+    Compute the advanced indicators for many symbols concurrently.
+    The Numba kernels run without the GIL, so worker threads overlap. Results keep input order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        return list(ex.map(_compute_per_symbol, dfs))
@@ -12,20 +12,71 @@ def _nan_to_num(x: float, default: float = 0.0) -> float:
     return default if (x is None or (isinstance(x, float) and (np.isnan(x) or np.isinf(x)))) else x
 
 
+def _last_values(ind: Dict) -> Dict[str, float]:
+    """Final-bar value of every indicator as a plain float (NaN for empty arrays)."""
+    last = {}
+    for k, v in ind.items():
+        if v is None:
+            continue
+        if isinstance(v, np.ndarray):
+            last[k] = float(v[-1]) if v.size else np.nan
+        else:
+            last[k] = float(v)
+    return last
+
+
+_SIG_CODES = {'buy': 1, 'sell': -1}
+# Integer code per signal category, used to index the regime weight array
+_CAT = {'trend': 0, 'range': 1, 'volume': 2, 'pattern': 3, 'baseline': 4}
+_CAT_BASELINE = _CAT['baseline']
+
+
+# Index sums for the 20-bar divergence window, computed once at import
+_X20 = np.arange(20, dtype=np.float64)
+_X20_SUM = _X20.sum()
+_X20_SUMSQ = _X20.dot(_X20)
+
+
+def _fast_slope(y: np.ndarray) -> float:
+    """Least-squares slope of y against its index, ignoring NaNs (closed form, no polyfit)."""
+    if y.size == 20 and not np.isnan(y).any():
+        # Fast path: full window, index sums precomputed
+        sy = y.sum()
+        sxy = _X20.dot(y)
+        return float((20 * sxy - _X20_SUM * sy) / (20 * _X20_SUMSQ - _X20_SUM * _X20_SUM))
+    mask = ~np.isnan(y)
+    n = int(mask.sum())
+    if n < 2:
+        return 0.0
+    x = np.arange(y.size, dtype=np.float64)[mask]
+    yy = y[mask]
+    sx = x.sum()
+    sy = yy.sum()
+    sxx = x.dot(x)
+    sxy = x.dot(yy)
+    return float((n * sxy - sx * sy) / (n * sxx - sx * sx))
+
+
 class AdvancedSignalGenerator:
     def __init__(self, data: pd.DataFrame, base_ind: Dict[str, np.ndarray], extra_ind: Dict[str, np.ndarray]):
         self.data = data
         self.base = base_ind
         self.extra = extra_ind
-        self.close = data['close'].astype(float).values
+        self.close = data['close'].to_numpy(dtype=np.float64, copy=False)
+        self.price = float(self.close[-1])
+        # Final-bar values, looked up once instead of re-indexing in every signal
+        self.last_base = _last_values(base_ind)
+        self.last_extra = _last_values(extra_ind)
 
         # Compute regime weights once
         self.regime, self.weights = self._detect_regime()
+        # Same weights ordered by _CAT code
+        self.weights_arr = np.array([self.weights[c] for c in _CAT], dtype=np.float64)
 
     def _detect_regime(self) -> Tuple[str, Dict[str, float]]:
-        adx = float(self.base.get('ADX', np.array([np.nan]))[-1]) if 'ADX' in self.base else np.nan
-        bb_w = float(self.base.get('BB_Width', self.extra.get('BB_Width', np.array([np.nan])))[-1]) if ('BB_Width' in self.base or 'BB_Width' in self.extra) else np.nan
-        atr_pct = float(self.extra.get('ATR_Pct', np.array([np.nan]))[-1]) if 'ATR_Pct' in self.extra else np.nan
+        adx = self.last_base.get('ADX', np.nan)
+        bb_w = self.last_base.get('BB_Width', self.last_extra.get('BB_Width', np.nan))
+        atr_pct = self.last_extra.get('ATR_Pct', np.nan)
 
         adx_thr = REGIME_THRESHOLDS.get('ADX_trend', 25)
         bb_low = REGIME_THRESHOLDS.get('BB_width_low', 5.0)
@@ -81,31 +132,13 @@ class AdvancedSignalGenerator:
         rsi_win = rsi[-lb:]
         macd_win = macd[-lb:]
         
-        # Simple Peak/Valley detection (extremas)
-        # This is a simplified heuristic. Real implementations use pivot points.
-        
-        price_low_idx = np.argmin(price_win)
-        price_high_idx = np.argmax(price_win)
-        
-        rsi_low_idx = np.argmin(rsi_win)
-        rsi_high_idx = np.argmax(rsi_win)
-        
         # Bullish Divergence: Price Low is lower than previous, but RSI Low is higher?
         # Simplified Check: Price Min is at end, RSI Min is earlier? Or Price trend down, RSI trend up?
         
         # Use slope over the window for a robust check
-        def get_slope(arr):
-            if len(arr) < 2: return 0
-            x = np.arange(len(arr))
-            # Remove NaNs
-            mask = ~np.isnan(arr)
-            if np.sum(mask) < 2: return 0
-            slope, _ = np.polyfit(x[mask], arr[mask], 1)
-            return slope
-
-        p_slope = get_slope(price_win)
-        rsi_slope = get_slope(rsi_win)
-        macd_slope = get_slope(macd_win)
+        p_slope = _fast_slope(price_win)
+        rsi_slope = _fast_slope(rsi_win)
+        macd_slope = _fast_slope(macd_win)
         
         signal = 'neutral'
         desc = []
@@ -144,49 +177,44 @@ class AdvancedSignalGenerator:
         }
 
     def _supertrend_signal(self) -> Dict:
-        st_dir = self.extra.get('ST_Direction')
-        st = self.extra.get('SuperTrend')
-        if st_dir is None or st is None:
+        direction = self.last_extra.get('ST_Direction')
+        st = self.last_extra.get('SuperTrend')
+        if direction is None or st is None:
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'trend'}
-        direction = st_dir[-1]
-        price = self.close[-1]
-        dist = abs(_nan_to_num(price - st[-1]))
+        price = self.price
+        dist = abs(_nan_to_num(price - st))
         rel = 0.0 if price == 0 else min(dist / price * 1000, 1.0)  # cap
         strength = int(50 + 50 * rel)
-        if direction > 0 and price >= st[-1]:
+        if direction > 0 and price >= st:
             return {'signal': 'buy', 'strength': strength, 'description': 'SuperTrend 上行', 'category': 'trend'}
-        elif direction < 0 and price <= st[-1]:
+        elif direction < 0 and price <= st:
             return {'signal': 'sell', 'strength': strength, 'description': 'SuperTrend 下行', 'category': 'trend'}
         else:
             return {'signal': 'neutral', 'strength': 0, 'description': 'SuperTrend 中性', 'category': 'trend'}
 
     def _ichimoku_signal(self) -> Dict:
-        tenkan = self.extra.get('Ichimoku_Tenkan')
-        kijun = self.extra.get('Ichimoku_Kijun')
-        sa = self.extra.get('Ichimoku_SenkouA')
-        sb = self.extra.get('Ichimoku_SenkouB')
-        chikou = self.extra.get('Ichimoku_Chikou')
+        tenkan = self.last_extra.get('Ichimoku_Tenkan')
+        kijun = self.last_extra.get('Ichimoku_Kijun')
+        sa = self.last_extra.get('Ichimoku_SenkouA')
+        sb = self.last_extra.get('Ichimoku_SenkouB')
+        chikou = self.last_extra.get('Ichimoku_Chikou')
         if any(x is None for x in [tenkan, kijun, sa, sb]):
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'trend'}
         
         # Check for NaNs at the current index before computation to avoid RuntimeWarnings
-        if np.isnan(sa[-1]) or np.isnan(sb[-1]):
+        if np.isnan(sa) or np.isnan(sb):
             return {'signal': 'N/A', 'strength': 0, 'description': '一目云数据不足 (NaN)', 'category': 'trend'}
             
-        price = self.close[-1]
-        cloud_top = np.nanmax([sa[-1], sb[-1]])
-        cloud_bottom = np.nanmin([sa[-1], sb[-1]])
-
-        # Handle NaN values in cloud result (double check)
-        if np.isnan(cloud_top) or np.isnan(cloud_bottom):
-            return {'signal': 'N/A', 'strength': 0, 'description': '一目云数据不足', 'category': 'trend'}
+        price = self.price
+        # Both spans are non-NaN here, so a plain comparison is enough
+        cloud_top, cloud_bottom = (sa, sb) if sa > sb else (sb, sa)
 
-        bullish = (price > cloud_top) and (tenkan[-1] > kijun[-1])
-        bearish = (price < cloud_bottom) and (tenkan[-1] < kijun[-1])
+        bullish = (price > cloud_top) and (tenkan > kijun)
+        bearish = (price < cloud_bottom) and (tenkan < kijun)
         # optional chikou filter
-        if chikou is not None and not np.isnan(chikou[-1]):
-            bullish = bullish and chikou[-1] > price
-            bearish = bearish and chikou[-1] < price
+        if chikou is not None and not np.isnan(chikou):
+            bullish = bullish and chikou > price
+            bearish = bearish and chikou < price
         span = cloud_top - cloud_bottom
         rel = 0.0 if span == 0 else min(abs(price - (cloud_top if bullish else cloud_bottom)) / span, 1.0)
         rel = _nan_to_num(rel, 0.0)  # Handle any remaining NaN
@@ -198,33 +226,33 @@ class AdvancedSignalGenerator:
         return {'signal': 'neutral', 'strength': 0, 'description': '一目中性', 'category': 'trend'}
 
     def _donchian_signal(self) -> Dict:
-        up = self.extra.get('Donchian_Upper')
-        lo = self.extra.get('Donchian_Lower')
+        up = self.last_extra.get('Donchian_Upper')
+        lo = self.last_extra.get('Donchian_Lower')
         if up is None or lo is None:
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'trend'}
-        price = self.close[-1]
-        rng = up[-1] - lo[-1]
+        price = self.price
+        rng = up - lo
         if rng <= 0 or np.isnan(rng):
             return {'signal': 'neutral', 'strength': 0, 'description': '通道无效', 'category': 'trend'}
-        if price >= up[-1]:
+        if price >= up:
             return {'signal': 'buy', 'strength': 70, 'description': '唐奇安上沿突破', 'category': 'trend'}
-        elif price <= lo[-1]:
+        elif price <= lo:
             return {'signal': 'sell', 'strength': 70, 'description': '唐奇安下沿跌破', 'category': 'trend'}
         else:
             return {'signal': 'neutral', 'strength': 0, 'description': '通道内震荡', 'category': 'range'}
 
     def _keltner_squeeze_signal(self) -> Dict:
-        ku = self.extra.get('Keltner_Upper')
-        kl = self.extra.get('Keltner_Lower')
-        bu = self.base.get('BB_Upper')
-        bl = self.base.get('BB_Lower')
+        ku = self.last_extra.get('Keltner_Upper')
+        kl = self.last_extra.get('Keltner_Lower')
+        bu = self.last_base.get('BB_Upper')
+        bl = self.last_base.get('BB_Lower')
         if any(x is None for x in [ku, kl, bu, bl]):
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'range'}
-        price = self.close[-1]
-        squeeze_on = (bu[-1] < ku[-1]) and (bl[-1] > kl[-1])
-        if squeeze_on and price > ku[-1]:
+        price = self.price
+        squeeze_on = (bu < ku) and (bl > kl)
+        if squeeze_on and price > ku:
             return {'signal': 'buy', 'strength': 80, 'description': 'Squeeze 向上释放', 'category': 'trend'}
-        elif squeeze_on and price < kl[-1]:
+        elif squeeze_on and price < kl:
             return {'signal': 'sell', 'strength': 80, 'description': 'Squeeze 向下释放', 'category': 'trend'}
         elif squeeze_on:
             return {'signal': 'neutral', 'strength': 0, 'description': 'Squeeze 盘整', 'category': 'range'}
@@ -232,12 +260,10 @@ class AdvancedSignalGenerator:
             return {'signal': 'neutral', 'strength': 0, 'description': '非Squeeze', 'category': 'range'}
 
     def _moneyflow_signal(self) -> Dict:
-        mfi = self.extra.get('MFI')
-        cmf = self.extra.get('CMF')
-        if mfi is None or cmf is None:
+        mfi_v = self.last_extra.get('MFI')
+        cmf_v = self.last_extra.get('CMF')
+        if mfi_v is None or cmf_v is None:
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'volume'}
-        mfi_v = mfi[-1]
-        cmf_v = cmf[-1]
         if np.isnan(mfi_v) or np.isnan(cmf_v):
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'volume'}
         if mfi_v < 20 and cmf_v > 0:
@@ -248,14 +274,14 @@ class AdvancedSignalGenerator:
             return {'signal': 'neutral', 'strength': 0, 'description': f'MFI/CMF 中性 ({mfi_v:.1f},{cmf_v:.2f})', 'category': 'volume'}
 
     def _ppo_tsi_signal(self) -> Dict:
-        ppo = self.extra.get('PPO')
-        ppo_sig = self.extra.get('PPO_Signal')
-        tsi = self.extra.get('TSI')
-        tsi_sig = self.extra.get('TSI_Signal')
+        ppo = self.last_extra.get('PPO')
+        ppo_sig = self.last_extra.get('PPO_Signal')
+        tsi = self.last_extra.get('TSI')
+        tsi_sig = self.last_extra.get('TSI_Signal')
         if any(x is None for x in [ppo, ppo_sig, tsi, tsi_sig]):
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'trend'}
-        ppo_bull = ppo[-1] > ppo_sig[-1]
-        tsi_bull = tsi[-1] > tsi_sig[-1]
+        ppo_bull = ppo > ppo_sig
+        tsi_bull = tsi > tsi_sig
         if ppo_bull and tsi_bull:
             return {'signal': 'buy', 'strength': 75, 'description': 'PPO & TSI 同步看多', 'category': 'trend'}
         elif (not ppo_bull) and (not tsi_bull):
@@ -264,24 +290,22 @@ class AdvancedSignalGenerator:
             return {'signal': 'neutral', 'strength': 0, 'description': 'PPO/TSI 分歧', 'category': 'trend'}
 
     def _kama_signal(self) -> Dict:
-        kama = self.extra.get('KAMA')
-        kama_slope = self.extra.get('KAMA_Slope')
-        if kama is None or kama_slope is None:
+        kama = self.last_extra.get('KAMA')
+        slope = self.last_extra.get('KAMA_Slope')
+        if kama is None or slope is None:
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'trend'}
-        price = self.close[-1]
-        slope = kama_slope[-1]
-        if price > kama[-1] and slope > 0:
+        price = self.price
+        if price > kama and slope > 0:
             return {'signal': 'buy', 'strength': 60, 'description': 'KAMA 上行', 'category': 'trend'}
-        elif price < kama[-1] and slope < 0:
+        elif price < kama and slope < 0:
             return {'signal': 'sell', 'strength': 60, 'description': 'KAMA 下行', 'category': 'trend'}
         else:
             return {'signal': 'neutral', 'strength': 0, 'description': 'KAMA 中性', 'category': 'trend'}
 
     def _force_index_signal(self) -> Dict:
-        fi = self.extra.get('ForceIndex')
-        if fi is None:
+        v = self.last_extra.get('ForceIndex')
+        if v is None:
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'volume'}
-        v = fi[-1]
         if np.isnan(v):
             return {'signal': 'N/A', 'strength': 0, 'description': '数据不足', 'category': 'volume'}
         if v > 0:
@@ -294,30 +318,18 @@ class AdvancedSignalGenerator:
     def score(self, signals: Dict[str, Dict]) -> Dict:
         # Merge base and advanced signals externally; here assume input already merged
         # Only directional signals contribute; category-weighted, strength 0-100 normalized
-        total_weight = 0.0
-        agg = 0.0
-        buy_count = 0
-        sell_count = 0
-        neutral_count = 0
-
-        for name, s in signals.items():
-            sig = s.get('signal', 'neutral')
-            if sig == 'N/A':
-                continue
-            category = s.get('category', 'baseline')
-            weight = self.weights.get(category, 1.0)
-            strength = float(_nan_to_num(s.get('strength', 0), 0.0)) / 100.0
-
-            if sig == 'buy':
-                agg += weight * strength
-                total_weight += weight
-                buy_count += 1
-            elif sig == 'sell':
-                agg -= weight * strength
-                total_weight += weight
-                sell_count += 1
-            else:
-                neutral_count += 1
+        active = [s for s in signals.values() if s.get('signal', 'neutral') != 'N/A']
+        n = len(active)
+        # Direction code per signal: +1 buy, -1 sell, 0 neutral
+        codes = np.fromiter((_SIG_CODES.get(s.get('signal', 'neutral'), 0) for s in active), dtype=np.int8, count=n)
+        cat_codes = np.fromiter((_CAT.get(s.get('category', 'baseline'), _CAT_BASELINE) for s in active), dtype=np.intp, count=n)
+        weights = self.weights_arr[cat_codes]
+        strengths = np.fromiter((float(_nan_to_num(s.get('strength', 0), 0.0)) for s in active), dtype=np.float64, count=n)
+        strengths /= 100.0
+
+        agg = float(np.dot(codes * weights, strengths))
+        total_weight = float(weights[codes != 0].sum())
+        sell_count, neutral_count, buy_count = (int(c) for c in np.bincount(codes + 1, minlength=3))
 
         score = 0.0 if total_weight == 0 else 100.0 * agg / total_weight
 
@@ -11,16 +11,29 @@ Key responsibilities:
 import sys
 import io
 import json
+import math
+import copy
+import time
+import threading
+import traceback
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict
 
 import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to json + NumpyEncoder
+    orjson = None
+
 # Fix Windows console encoding for stdout
 # if sys.platform == "win32":
 #     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
 
+from config import DEBUG, FLOAT32_STORAGE
 from data_fetcher import DataFetcher
 from indicators import TechnicalIndicators, PatternRecognizer
 from signals import SignalGenerator
@@ -38,9 +51,210 @@ from advanced_indicators import (
 from advanced_signals import AdvancedSignalGenerator
 
 
+_OHLCV_COLS = ('open', 'high', 'low', 'close', 'volume')
+
+# Indicators reported by get_key_indicators / get_ma_levels
+_KEY_IND_NAMES = ('RSI_14', 'K', 'D', 'J', 'MACD', 'MACD_Signal', 'ADX', 'ATR', 'CCI', 'WILLR')
+_MA_LEVEL_NAMES = ('SMA_5', 'SMA_10', 'SMA_20', 'SMA_60', 'SMA_120', 'SMA_250', 'EMA_12', 'EMA_26', 'EMA_50')
+
+# Recent _run_analysis results, keyed by (symbol, days, period, use_proxy) and
+# reused for ANALYSIS_TTL seconds (short, so intraday bars stay fresh). Expired
+# entries are dropped on every put, so nothing outlives its TTL for long.
+ANALYSIS_TTL = 60
+ANALYSIS_CACHE_SIZE = 64
+_analysis_lock = threading.Lock()
+_analysis_cache = OrderedDict()  # key -> (timestamp, result)
+
+
+def _to_float32(ind: Dict) -> Dict:
+    """Downcast float64 indicator arrays to float32; scalars are left untouched."""
+    return {
+        k: (v.astype(np.float32) if isinstance(v, np.ndarray) and v.dtype == np.float64 else v)
+        for k, v in ind.items()
+    }
+
+
+def _freeze_arrays(ind: Dict) -> Dict:
+    """Mark the indicator arrays read-only so the memoized copies cannot be mutated in place."""
+    for v in ind.values():
+        if isinstance(v, np.ndarray):
+            v.setflags(write=False)
+    return ind
+
+
+def _nan_to_none_list(arr: np.ndarray) -> list:
+    return [None if (isinstance(x, float) and not math.isfinite(x)) else x for x in arr.tolist()]
+
+
+class NumpyEncoder(json.JSONEncoder):
+    """JSON encoder that serializes numpy arrays/scalars at the leaves, NaN/inf -> null."""
+
+    def default(self, o):
+        if isinstance(o, np.ndarray):
+            return _nan_to_none_list(o)
+        if isinstance(o, np.integer):
+            return int(o)
+        if isinstance(o, np.floating):
+            v = float(o)
+            return v if math.isfinite(v) else None
+        return super().default(o)
+
+
+def _finite_scalars(obj):
+    """
+    Replace non-finite float scalars with None in the small metadata dicts.
+    Arrays are left for NumpyEncoder, so the indicator payload is only walked once.
+    """
+    if isinstance(obj, dict):
+        return {k: _finite_scalars(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_finite_scalars(v) for v in obj]
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+if orjson is not None:
+    _ORJSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def _orjson_default(o):
+    """Fallback for values orjson cannot serialize natively (e.g. non-contiguous arrays)."""
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if isinstance(o, np.generic):
+        return o.item()
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+
+class _AnalysisFailed(Exception):
+    """Expected pipeline failure; the message is reported as StockAnalyzer.last_error."""
+
+
+def _cached_analysis(symbol: str, days: int, period: str, use_proxy: bool) -> Dict:
+    """_run_analysis through the TTL cache. Failures raise and are therefore never cached."""
+    key = (symbol, days, period, use_proxy)
+    with _analysis_lock:
+        hit = _analysis_cache.get(key)
+        if hit is not None and time.time() - hit[0] < ANALYSIS_TTL:
+            return hit[1]
+
+    res = _run_analysis(symbol, days, period, use_proxy)
+
+    with _analysis_lock:
+        now = time.time()
+        _analysis_cache[key] = (now, res)
+        _analysis_cache.move_to_end(key)
+        for k in [k for k, (ts, _) in _analysis_cache.items() if now - ts >= ANALYSIS_TTL]:
+            del _analysis_cache[k]
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return res
+
+
+def _run_analysis(symbol: str, days: int, period: str, use_proxy: bool) -> Dict:
+    """
+    Full analysis pipeline for one symbol. The returned objects may be shared
+    through _analysis_cache: arrays are read-only and StockAnalyzer.analyze
+    copies the rest.
+    """
+    fetcher = DataFetcher(use_proxy=use_proxy)
+
+    # 1) stock info
+    try:
+        stock_info = fetcher.get_stock_info(symbol)
+    except Exception as e:
+        raise _AnalysisFailed(f"Error fetching stock info: {str(e)}")
+    if not stock_info:
+        raise _AnalysisFailed(f"Stock info not found for symbol: {symbol}")
+
+    # 2) OHLCV data
+    try:
+        data = fetcher.get_stock_data(symbol, days=days, period=period)
+    except Exception as e:
+        raise _AnalysisFailed(f"Error fetching historical data: {str(e)}")
+    if data is None or len(data) == 0:
+        raise _AnalysisFailed(f"No historical data found for {symbol} (period={period})")
+
+    # Steps 3, 4 and the per-frame part of 6 only read the data, so they run
+    # concurrently; talib and the Numba kernels release the GIL.
+    # OHLCV as contiguous float64 arrays (SoA), converted once and shared
+    # by every indicator computation below
+    arrays = {
+        c: np.ascontiguousarray(data[c].to_numpy(dtype=np.float64))
+        for c in _OHLCV_COLS
+    }
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        fut_ind = ex.submit(lambda: TechnicalIndicators(arrays).calculate_all())
+        fut_pat = ex.submit(lambda: PatternRecognizer(arrays).detect_all_patterns())
+        adv_jobs = [
+            (compute_supertrend, (arrays,)),
+            (compute_ichimoku, (arrays,)),
+            (compute_donchian, (arrays,)),
+            (compute_keltner, (arrays,)),
+            (compute_moneyflow, (arrays,)),
+            (compute_momentum_extra, (arrays,)),
+            (compute_vwma, (arrays,)),
+            (compute_fibonacci_levels, (arrays,)),
+        ]
+        adv_futs = [(fn, ex.submit(fn, *args)) for fn, args in adv_jobs]
+
+        # 3) technical indicators
+        try:
+            indicators = fut_ind.result()
+        except Exception as e:
+            raise _AnalysisFailed(f"Indicator calculation failed: {str(e)}")
+        tail_cache = {k: (float(v[-1]) if len(v) else np.nan) for k, v in indicators.items()}
+
+        # 4) patterns
+        patterns = fut_pat.result()
+
+        # 5) base signals + score (legacy)
+        base_signal_gen = SignalGenerator(data, indicators, patterns)
+        base_signals = base_signal_gen.generate_all_signals()
+
+        # 6) advanced indicators + signals + score
+        # A failing indicator is logged and skipped; the others are still kept
+        results = []
+        for fn, fut in adv_futs:
+            try:
+                results.append(fut.result())
+            except Exception as e:
+                print(f"Warning: Advanced indicator {fn.__name__} failed: {e}")
+        try:
+            results.append(compute_regime_features(arrays, indicators))
+        except Exception as e:
+            print(f"Warning: Advanced indicator compute_regime_features failed: {e}")
+        extra_ind = {k: v for d in results for k, v in d.items()}
+
+    adv_gen = AdvancedSignalGenerator(data, indicators, extra_ind)
+    adv_signals = adv_gen.generate()
+    signals = {**base_signals, **adv_signals}
+
+    return {
+        'stock_info': stock_info,
+        'data': data,
+        'indicators': _freeze_arrays(indicators),
+        'tail_cache': tail_cache,
+        'patterns': patterns,
+        'extra_indicators': _freeze_arrays(extra_ind),
+        'signals': signals,
+        'score': adv_gen.score(signals),
+    }
+
+
 class StockAnalyzer:
-    def __init__(self, use_proxy: bool = True):
-        self.fetcher = DataFetcher(use_proxy=use_proxy)
+    # Instances are created per request in the web app; slots keep them small
+    __slots__ = (
+        'use_proxy', 'float32_storage', 'data', 'stock_info', 'indicators', 'patterns',
+        'signals', 'extra_indicators', '综合评分', 'last_error', '_tail_cache',
+    )
+
+    def __init__(self, use_proxy: bool = True, float32_storage: bool = FLOAT32_STORAGE):
+        self.use_proxy = use_proxy
+        # Keep indicator arrays as float32 once scoring is done (halves their memory;
+        # all computation and signals still run in float64); defaults to STOCK_FLOAT32_STORAGE=1
+        self.float32_storage = float32_storage
         self.data = None
         self.stock_info = None
         self.indicators = None
@@ -49,83 +263,41 @@ class StockAnalyzer:
         self.extra_indicators = None
         self.综合评分 = None
         self.last_error = None  # Store specific error messages
+        self._tail_cache = {}  # final-bar value of every base indicator
 
     def analyze(self, symbol: str, days: int = 120, period: str = "daily") -> bool:
-        """Run full analysis pipeline."""
+        """Run full analysis pipeline (cached per symbol/days/period for ANALYSIS_TTL seconds)."""
         self.last_error = None
         
         try:
-            # 1) stock info
-            try:
-                self.stock_info = self.fetcher.get_stock_info(symbol)
-                if not self.stock_info:
-                    self.last_error = f"Stock info not found for symbol: {symbol}"
-                    print(self.last_error)
-                    return False
-            except Exception as e:
-                self.last_error = f"Error fetching stock info: {str(e)}"
-                print(self.last_error)
-                return False
-
-            # 2) OHLCV data
-            try:
-                self.data = self.fetcher.get_stock_data(symbol, days=days, period=period)
-                if self.data is None or len(self.data) == 0:
-                    self.last_error = f"No historical data found for {symbol} (period={period})"
-                    print(self.last_error)
-                    return False
-            except Exception as e:
-                self.last_error = f"Error fetching historical data: {str(e)}"
-                print(self.last_error)
-                return False
-
-            # 3) technical indicators
-            try:
-                indicator_calc = TechnicalIndicators(self.data)
-                self.indicators = indicator_calc.calculate_all()
-            except Exception as e:
-                 self.last_error = f"Indicator calculation failed: {str(e)}"
-                 print(self.last_error)
-                 return False
+            res = _cached_analysis(symbol, days, period, self.use_proxy)
+        except _AnalysisFailed as e:
+            self.last_error = str(e)
+            print(self.last_error)
+            return False
+        except (KeyError, ValueError, IndexError, TypeError, RuntimeError) as e:
+            # Data-dependent failures are reported; anything else propagates to the caller
+            if DEBUG:
+                traceback.print_exc()
+            self.last_error = f"Unexpected analyzer crash: {str(e)}"
+            return False
 
-            # 4) patterns
-            recognizer = PatternRecognizer(self.data)
-            self.patterns = recognizer.detect_all_patterns()
+        # The memoized result is shared between instances: hand out copies of the
+        # frame and dicts (indicator arrays are already read-only)
+        self.stock_info = dict(res['stock_info'])
+        self.data = res['data'].copy()
+        self.indicators = dict(res['indicators'])
+        self._tail_cache = dict(res['tail_cache'])
+        self.patterns = copy.deepcopy(res['patterns'])
+        self.extra_indicators = dict(res['extra_indicators'])
+        self.signals = copy.deepcopy(res['signals'])
+        self.综合评分 = copy.deepcopy(res['score'])
 
-            # 5) base signals + score (legacy)
-            base_signal_gen = SignalGenerator(self.data, self.indicators, self.patterns)
-            base_signals = base_signal_gen.generate_all_signals()
+        if self.float32_storage:
+            self.indicators = _to_float32(self.indicators)
+            self.extra_indicators = _to_float32(self.extra_indicators)
 
-            # 6) advanced indicators + signals + score
-            extra_ind = {}
-            try:
-                extra_ind.update(compute_supertrend(self.data))
-                extra_ind.update(compute_ichimoku(self.data))
-                extra_ind.update(compute_donchian(self.data))
-                extra_ind.update(compute_keltner(self.data))
-                extra_ind.update(compute_moneyflow(self.data))
-                extra_ind.update(compute_momentum_extra(self.data))
-                extra_ind.update(compute_vwma(self.data))
-                extra_ind.update(compute_fibonacci_levels(self.data))
-                extra_ind.update(compute_regime_features(self.data, self.indicators))
-            except Exception as e:
-                # If any advanced indicator fails, log but continue with available ones
-                print(f"Warning: Advanced indicators partial failure: {e}")
-            
-            self.extra_indicators = extra_ind
-
-            adv_gen = AdvancedSignalGenerator(self.data, self.indicators, extra_ind)
-            adv_signals = adv_gen.generate()
-            self.signals = {**base_signals, **adv_signals}
-            self.综合评分 = adv_gen.score(self.signals)
-
-            return True
-            
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            self.last_error = f"Unexpected analyzer crash: {str(e)}"
-            return False
+        return True
 
     def get_price_info(self) -> Dict:
         if self.data is None:
@@ -147,34 +319,15 @@ class StockAnalyzer:
     def get_key_indicators(self) -> Dict:
         if self.indicators is None:
             return {}
-        def _last(name):
-            v = self.indicators.get(name)
-            if v is None:
-                return np.nan
-            return float(v[-1]) if len(v) else np.nan
-
-        return {
-            'RSI_14': _last('RSI_14'),
-            'K': _last('K'),
-            'D': _last('D'),
-            'J': _last('J'),
-            'MACD': _last('MACD'),
-            'MACD_Signal': _last('MACD_Signal'),
-            'ADX': _last('ADX'),
-            'ATR': _last('ATR'),
-            'CCI': _last('CCI'),
-            'WILLR': _last('WILLR'),
-        }
+        tail = self._tail_cache
+        return {k: tail.get(k, np.nan) for k in _KEY_IND_NAMES}
 
     def get_ma_levels(self) -> Dict:
         if self.indicators is None:
             return {}
-        ma_keys = ['SMA_5', 'SMA_10', 'SMA_20', 'SMA_60', 'SMA_120', 'SMA_250', 'EMA_12', 'EMA_26', 'EMA_50']
-        levels = {}
-        for k in ma_keys:
-            if k in self.indicators and len(self.indicators[k]) > 0:
-                levels[k] = float(self.indicators[k][-1])
-        return levels
+        tail = self._tail_cache
+        # Empty indicator arrays have no level and are left out
+        return {k: tail[k] for k in _MA_LEVEL_NAMES if k in tail and len(self.indicators[k]) > 0}
 
     # Optional: exporting helpers
     def export_to_json(self, filepath: str):
@@ -182,22 +335,6 @@ class StockAnalyzer:
             print('No data to export')
             return
 
-        def clean_obj(obj):
-            """Recursively convert numpy types to python types for JSON serialization."""
-            if isinstance(obj, dict):
-                return {k: clean_obj(v) for k, v in obj.items()}
-            elif isinstance(obj, (list, tuple)):
-                return [clean_obj(item) for item in obj]
-            elif isinstance(obj, np.ndarray):
-                return clean_obj(obj.tolist())
-            elif isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return None if (np.isnan(obj) or np.isinf(obj)) else float(obj)
-            elif isinstance(obj, float):
-                return None if (np.isnan(obj) or np.isinf(obj)) else obj
-            return obj
-
         raw_result = {
             'stock_info': self.stock_info,
             'analysis_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
@@ -210,10 +347,13 @@ class StockAnalyzer:
             'advanced_indicators': self.extra_indicators,
         }
         
-        final_result = clean_obj(raw_result)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(final_result, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            # orjson writes numpy arrays/scalars natively and NaN/inf as null
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(raw_result, default=_orjson_default, option=_ORJSON_OPTS))
+        else:
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(_finite_scalars(raw_result), f, cls=NumpyEncoder, ensure_ascii=False, indent=2)
         print(f'[OK] Exported JSON: {filepath}')
 
 
@@ -2,20 +2,45 @@
 import akshare as ak
 import sys
 import os
+import io
+import threading
 import pandas as pd
+import requests
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Target stock and period
 SYMBOL = "600000"
 START_DATE = "20240101"
 END_DATE = "20251119"
 
-def try_fetch(name):
-    print(f"\n--- Testing Configuration: {name} ---")
-    print(f"Environment Keys: {[k for k in os.environ.keys() if 'PROXY' in k.upper()]}")
+# Per-thread network configuration, so the probes can run side by side
+# without mutating the shared os.environ. The wrapper is only installed
+# on requests.Session while run_tests() is running.
+_local = threading.local()
+_original_request = requests.Session.request
+
+def _probe_request(self, method, url, *args, **kwargs):
+    cfg = getattr(_local, 'cfg', None)
+    if cfg is not None:
+        self.trust_env = cfg['trust_env']
+        if cfg['proxies'] is not None:
+            kwargs['proxies'] = dict(cfg['proxies'])
+    return _original_request(self, method, url, *args, **kwargs)
+
+def try_fetch(name, cfg=None):
+    # Buffer the report so concurrent probes don't interleave their output;
+    # returns (ok, report)
+    out = io.StringIO()
+    _local.cfg = cfg
+    print(f"\n--- Testing Configuration: {name} ---", file=out)
+    print(f"Environment Keys: {[k for k in os.environ.keys() if 'PROXY' in k.upper()]}", file=out)
     if 'HTTP_PROXY' in os.environ:
-        print(f"HTTP_PROXY: {os.environ['HTTP_PROXY']}")
+        print(f"HTTP_PROXY: {os.environ['HTTP_PROXY']}", file=out)
+    if cfg is not None:
+        print(f"Overrides: trust_env={cfg['trust_env']}, proxies={cfg['proxies']}", file=out)
     
+    ok = False
     try:
         df = ak.stock_zh_a_hist(
             symbol=SYMBOL, 
@@ -25,51 +50,46 @@ def try_fetch(name):
             adjust="qfq"
         )
         if df is not None and not df.empty:
-            print(f"✅ SUCCESS! Got {len(df)} rows.")
-            return True
+            print(f"✅ SUCCESS! Got {len(df)} rows.", file=out)
+            ok = True
         else:
-            print("❌ FAILED: Returned empty data.")
+            print("❌ FAILED: Returned empty data.", file=out)
     except Exception as e:
-        print(f"❌ FAILED: {e}")
-    return False
+        print(f"❌ FAILED: {e}", file=out)
+    finally:
+        _local.cfg = None
+    return ok, out.getvalue()
 
 def run_tests():
-    # 1. System Default (Inherited)
     print("Initializing...")
-    base_env = os.environ.copy()
-    
-    # Test 1: Default
-    if try_fetch("1. System Default"):
-        return
-
-    # Test 2: Force Direct (Delete Proxy Vars)
-    os.environ.update(base_env)
-    for k in list(os.environ.keys()):
-        if 'PROXY' in k.upper():
-            del os.environ[k]
-    
-    if try_fetch("2. Force Direct (Deleted Vars)"):
-        return
+    proxy_url = "http://127.0.0.1:7897"
+    configs = [
+        # 1. System Default (Inherited)
+        ("1. System Default", None),
+        # 2. Force Direct: ignore the proxy environment variables
+        ("2. Force Direct (Deleted Vars)", {'trust_env': False, 'proxies': None}),
+        # 3. Force Direct + NO_PROXY='*'
+        ("3. Force Direct + NO_PROXY='*'", {'trust_env': True, 'proxies': {'no_proxy': '*'}}),
+        # 4. Force Specific Proxy (if known 7897)
+        (f"4. Force Specific Proxy ({proxy_url})", {'trust_env': True, 'proxies': {'http': proxy_url, 'https': proxy_url}}),
+    ]
 
-    # Test 3: Force Direct + NO_PROXY='*'
-    os.environ.update(base_env)
-    for k in list(os.environ.keys()):
-        if 'PROXY' in k.upper():
-            del os.environ[k]
-    os.environ['NO_PROXY'] = '*'
-    
-    if try_fetch("3. Force Direct + NO_PROXY='*'"):
-        return
+    # The probes are independent and network-bound, so they run concurrently;
+    # results are reported in the order above and the first one that works wins
+    requests.Session.request = _probe_request
+    try:
+        with ThreadPoolExecutor(max_workers=len(configs)) as ex:
+            results = list(ex.map(lambda c: try_fetch(*c), configs))
+    finally:
+        requests.Session.request = _original_request
 
-    # Test 4: Force Specific Proxy (if known 7897)
-    os.environ.update(base_env)
-    proxy_url = "http://127.0.0.1:7897"
-    os.environ['HTTP_PROXY'] = proxy_url
-    os.environ['HTTPS_PROXY'] = proxy_url
-    if 'NO_PROXY' in os.environ: del os.environ['NO_PROXY']
-    
-    if try_fetch(f"4. Force Specific Proxy ({proxy_url})"):
-        return
+    for ok, report in results:
+        print(report, end='')
+    for (name, _), (ok, _) in zip(configs, results):
+        if ok:
+            print(f"\n>>> Working configuration: {name}")
+            return
+    print("\n>>> No configuration succeeded.")
 
 if __name__ == "__main__":
     run_tests()
@@ -8,6 +8,12 @@ import os
 DEFAULT_DAYS = 120
 DEFAULT_ADJUST = 'qfq'
 
+# Print full tracebacks for unexpected analyzer errors
+DEBUG = os.environ.get('STOCK_ANALYZER_DEBUG', '') == '1'
+
+# Keep indicator arrays as float32 after scoring (halves their memory in long-running servers)
+FLOAT32_STORAGE = os.environ.get('STOCK_FLOAT32_STORAGE', '') == '1'
+
 # Output Settings
 OUTPUT_DIR = 'output'
 os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -2,7 +2,7 @@
 Data Fetcher Module (A-Share + US-Stock Support)
 Features:
 1. Default Fetch Range: 400 days (Natural Days)
-2. Proxy: Forced to http://127.0.0.1:7897
+2. Proxy: optional, set STOCK_PROXY (e.g. http://127.0.0.1:7897)
 3. Auto-detects Market (US/CN)
 """
 
@@ -10,18 +10,206 @@ import sys
 import io
 import os
 import random
+import re
+import functools
+import pickle
+import threading
+import time
+import urllib.request
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import akshare as ak
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 # ================= 配置区域 =================
 # 默认获取天数改为 400 天（自然日），以确保能计算年线(MA250)
 DEFAULT_DAYS = 400 
 DEFAULT_ADJUST = 'qfq'
+# 清洗后 OHLCV 数值列的统一类型
+_NUMERIC_DTYPES = {
+    'open': 'float64', 'close': 'float64', 'high': 'float64',
+    'low': 'float64', 'volume': 'float64', 'amount': 'float64',
+}
+# 代理地址 (例如 http://127.0.0.1:7897)；未设置时不使用代理
+PROXY_URL = os.environ.get('STOCK_PROXY')
+# 本地 Parquet 行情缓存目录 (按 symbol/period/adjust 分文件)
+CACHE_DIR = os.environ.get('STOCK_CACHE_DIR', 'cache')
+# 共享连接池大小: Web 服务多线程并发请求时，每个主机保留的长连接数
+POOL_CONNECTIONS = int(os.environ.get('STOCK_POOL_CONNECTIONS', 40))
+POOL_MAXSIZE = int(os.environ.get('STOCK_POOL_MAXSIZE', 100))
 # ===========================================
 
+try:
+    import pyarrow  # noqa: F401  (parquet engine)
+    HAVE_PARQUET = True
+except ImportError:
+    HAVE_PARQUET = False
+
+# A股代码: 6位数字 (5位的港股代码等不再被误判为A股)
+_A_SHARE_RE = re.compile(r'[0-9]{6}')
+
+
+@functools.lru_cache(maxsize=4096)
+def _is_a_share(symbol: str) -> bool:
+    return _A_SHARE_RE.fullmatch(symbol) is not None
+
+
+@functools.lru_cache(maxsize=8)
+def _date_range(days: int, period: str, today: str) -> Tuple[str, str, str, str]:
+    """
+    Fetch window for `days` (scaled for weekly/monthly) ending on `today` (YYYYMMDD).
+    Returns (start YYYYMMDD, end YYYYMMDD, start YYYY-MM-DD, end YYYY-MM-DD);
+    `today` is part of the cache key so the window rolls over at midnight.
+    """
+    end_date = datetime.strptime(today, "%Y%m%d")
+
+    # Calculate start date
+    multiplier = 1
+    if period == "weekly": multiplier = 5
+    elif period == "monthly": multiplier = 22
+
+    # 使用传入的 days (默认400)
+    start_date = end_date - timedelta(days=days * multiplier)
+    return (
+        start_date.strftime("%Y%m%d"),
+        today,
+        start_date.strftime("%Y-%m-%d"),
+        end_date.strftime("%Y-%m-%d"),
+    )
+
+
+# A股交易时段 (北京时间，无夏令时)。收盘后留 30 分钟余量，等行情源落定当日K线
+_CN_TZ = timezone(timedelta(hours=8))
+_SESSION_OPEN = (9, 15)
+_SESSION_SETTLED = (15, 30)
+# 美股交易时段 (纽约时间，含夏令时)。Windows 未装 tzdata 时退回固定 UTC-5，夏令时期间偏差 1 小时
+try:
+    _US_TZ = ZoneInfo('America/New_York')
+except ZoneInfoNotFoundError:
+    _US_TZ = timezone(timedelta(hours=-5))
+_US_SESSION_OPEN = (9, 30)
+_US_SESSION_SETTLED = (16, 30)
+# 缓存首根K线可晚于请求起点的天数 (覆盖周末与春节/国庆长假)
+_CACHE_START_SLACK = {'daily': 10, 'weekly': 10, 'monthly': 31}
+
+
+def _settle_time(day: datetime, settled: Tuple[int, int] = _SESSION_SETTLED) -> datetime:
+    return day.replace(hour=settled[0], minute=settled[1], second=0, microsecond=0)
+
+
+def _last_settled_close(now: datetime, settled: Tuple[int, int] = _SESSION_SETTLED) -> datetime:
+    """Most recent weekday settle time (in now's timezone) at or before `now`; holidays are not modelled."""
+    t = _settle_time(now, settled)
+    if now < t:
+        t -= timedelta(days=1)
+    while t.weekday() >= 5:
+        t -= timedelta(days=1)
+    return t
+
+
+def _change_pct(close: pd.Series) -> np.ndarray:
+    """Close-to-close change in percent (first bar NaN), on the raw ndarray."""
+    c = close.to_numpy(dtype=np.float64)
+    pct = np.empty_like(c)
+    pct[:1] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Same operation order as pandas pct_change: c[t] / c[t-1] - 1
+        np.divide(c[1:], c[:-1], out=pct[1:])
+    pct[1:] -= 1
+    pct[1:] *= 100
+    return pct
+
+
+_proxy_lock = threading.Lock()
+_proxy_applied = False
+
+
+def _apply_proxy():
+    """Route the shared session through PROXY_URL, once per process (os.environ is left alone)."""
+    global _proxy_applied
+    if _proxy_applied or not PROXY_URL:
+        return
+    with _proxy_lock:
+        if _proxy_applied:
+            return
+        _SESSION.proxies.update(http=PROXY_URL, https=PROXY_URL)
+        _proxy_applied = True
+        print(f"[Info] Proxy enabled: {PROXY_URL}")
+
+
+# A股代码-名称表 (ak.stock_info_a_code_name，约5000行) 一天内只下载一次
+CODE_NAME_TTL = 24 * 3600
+_CODE_NAME_PKL = os.path.join(CACHE_DIR, 'code_name.pkl')
+# _code_name_lock 只保护内存缓存 (短暂持有)；下载另用一把锁，同一时刻只有一个线程在下载
+_code_name_lock = threading.Lock()
+_code_name_download_lock = threading.Lock()
+_code_name_cache = {'ts': 0.0, 'df': None, 'map': {}}
+
+
+def _cached_code_name_table():
+    """In-memory or on-disk table if still within the TTL, else None; publishes disk hits."""
+    with _code_name_lock:
+        now = time.time()
+        if _code_name_cache['df'] is not None and now - _code_name_cache['ts'] < CODE_NAME_TTL:
+            return _code_name_cache['df'], _code_name_cache['map']
+
+        if os.path.exists(_CODE_NAME_PKL) and now - os.path.getmtime(_CODE_NAME_PKL) < CODE_NAME_TTL:
+            try:
+                with open(_CODE_NAME_PKL, 'rb') as f:
+                    df = pickle.load(f)
+                ts = os.path.getmtime(_CODE_NAME_PKL)
+            except Exception as e:
+                print(f"[!] Code-name cache read error: {e}")
+                return None
+            code_map = dict(zip(df['code'].astype(str), df['name']))
+            _code_name_cache.update(ts=ts, df=df, map=code_map)
+            return df, code_map
+        return None
+
+
+def _load_code_name_table(download: bool = True):
+    """
+    Return (DataFrame, {code: name}); memoized in-process and on disk with a 24h TTL.
+    With download=False only an already-loaded or on-disk table is used, and
+    (None, {}) is returned instead of pulling the full listing from the network.
+    """
+    hit = _cached_code_name_table()
+    if hit is not None:
+        return hit
+    if not download:
+        return None, {}
+
+    with _code_name_download_lock:
+        # 等锁期间可能已有其他线程下载完成
+        hit = _cached_code_name_table()
+        if hit is not None:
+            return hit
+
+        df = ak.stock_info_a_code_name()
+        # 先写临时文件再原子替换，其他进程 (如多个 gunicorn worker) 不会读到写了一半的 pickle
+        tmp = f"{_CODE_NAME_PKL}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(tmp, 'wb') as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, _CODE_NAME_PKL)
+        except Exception as e:
+            print(f"[!] Code-name cache write error: {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+        code_map = dict(zip(df['code'].astype(str), df['name']))
+        with _code_name_lock:
+            _code_name_cache.update(ts=time.time(), df=df, map=code_map)
+        return df, code_map
+
 # === 黑魔法：请求伪装 (Stealth Mode) ===
 # 试图骗过反爬虫系统，伪造 IP 和 User-Agent
 def _random_ip():
@@ -54,6 +242,36 @@ def _patch_requests():
 
 # 激活伪装
 _patch_requests()
+
+# === 连接池: 所有 akshare 请求复用同一个 Session (HTTP keep-alive) ===
+# akshare 内部直接调用模块级 requests.get/post，每次都会新建 Session 并重新握手。
+# 进程内只安装一次，Flask 的所有请求线程共用这一个连接池。
+def _install_pooled_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    # 代理只由 session.proxies 决定: 系统代理在启动时读取一次 (STOCK_PROXY 会覆盖)，
+    # 之后每个请求不再读取 HTTP_PROXY 等环境变量，多线程下也无需改动 os.environ
+    session.trust_env = False
+    session.proxies = {k: v for k, v in urllib.request.getproxies().items() if k in ('http', 'https')}
+
+    # 保持 requests.get/post 的调用签名 (params/data/json 可按位置传入)
+    def pooled_get(url, params=None, **kwargs):
+        return session.get(url, params=params, **kwargs)
+
+    def pooled_post(url, data=None, json=None, **kwargs):
+        return session.post(url, data=data, json=json, **kwargs)
+
+    requests.get = pooled_get
+    requests.post = pooled_post
+    return session
+
+_SESSION = _install_pooled_session()
 # ===========================================
 
 class DataFetcher:
@@ -66,7 +284,69 @@ class DataFetcher:
 
     def __init__(self, use_proxy: bool = False):
         # In Render/Cloud environment, usually no proxy is needed.
-        pass
+        # 代理只在进程内首次构造时设置到共享 Session 上，不改动 os.environ
+        if use_proxy:
+            _apply_proxy()
+
+    # === Parquet 缓存 ===
+    def _cache_path(self, symbol: str, period: str, adjust: str) -> str:
+        return os.path.join(CACHE_DIR, f"{symbol}_{period}_{adjust or 'none'}.parquet")
+
+    def _load_cache(self, path: str) -> Optional[pd.DataFrame]:
+        if not HAVE_PARQUET or not os.path.exists(path):
+            return None
+        try:
+            return pd.read_parquet(path)
+        except Exception as e:
+            print(f"[!] Cache read error ({path}): {e}")
+            return None
+
+    def _save_cache(self, path: str, df: pd.DataFrame):
+        if not HAVE_PARQUET:
+            return
+        # 先写临时文件再原子替换: 并发线程/进程读到的总是完整文件
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            df.to_parquet(tmp, index=False, compression='zstd')
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"[!] Cache write error ({path}): {e}")
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+
+    def _drop_cache(self, path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # another thread already dropped it
+            pass
+
+    def _cache_is_current(self, path: str, tz=_CN_TZ,
+                          session: Tuple[Tuple[int, int], Tuple[int, int]] = (_SESSION_OPEN, _SESSION_SETTLED)) -> bool:
+        """
+        Bars cannot have changed since the cache was written: we are outside the
+        market's trading hours (`session` in `tz`, default A-share) and no session
+        has settled after the file was saved.
+        """
+        now = datetime.now(tz)
+        if now.weekday() < 5 and session[0] <= (now.hour, now.minute) < session[1]:
+            return False  # today's bar is still forming
+        try:
+            return os.path.getmtime(path) >= _last_settled_close(now, session[1]).timestamp()
+        except OSError:
+            return False
+
+    def _last_bar_final(self, path: str, cached: pd.DataFrame, period: str) -> bool:
+        """Whether the last cached bar was saved after its session settled (daily bars only)."""
+        if period != 'daily':
+            return False  # the current week/month bar stays open until the period ends
+        last = datetime.strptime(cached['date'].iloc[-1], '%Y-%m-%d').replace(tzinfo=_CN_TZ)
+        try:
+            return os.path.getmtime(path) >= _settle_time(last).timestamp()
+        except OSError:
+            return False
 
     def get_stock_data(
         self,
@@ -78,34 +358,33 @@ class DataFetcher:
         """
         Fetch historical stock data. Auto-detects A-Share vs US-Stock.
         """
-        end_date = datetime.now()
-        
-        # Calculate start date
-        multiplier = 1
-        if period == "weekly": multiplier = 5
-        elif period == "monthly": multiplier = 22
-        
-        # 使用传入的 days (默认400)
-        start_date = end_date - timedelta(days=days * multiplier)
-        
-        start_date_str = start_date.strftime("%Y%m%d")
-        end_date_str = end_date.strftime("%Y%m%d")
+        start_date_str, end_date_str, start_iso, end_iso = _date_range(
+            days, period, datetime.now().strftime("%Y%m%d"))
 
-        # 判断是否为美股 (如果不全是数字，则认为是美股)
-        is_us_stock = not symbol.isdigit()
+        # 判断是否为美股 (非6位数字代码则认为是美股)
+        is_us_stock = not _is_a_share(symbol)
         market_name = "US-Stock" if is_us_stock else "A-Share"
 
         print(f"Fetching {symbol} ({market_name}) from {start_date_str} ({days} days)...")
 
         try:
             df = None
+            cached = None
+            merge_cache = None
             if is_us_stock:
                 # === 美股接口 (ak.stock_us_daily) ===
-                try:
-                    df = ak.stock_us_daily(symbol=symbol, adjust=adjust)
-                except Exception as e:
-                    print(f"Akshare US fetch error: {e}")
-                    return None
+                # 该接口总是返回全量历史，无法增量请求；美股收盘落定后写入、且之后没有新交易日时直接复用
+                cache_path = self._cache_path(symbol, 'daily', adjust)
+                if self._cache_is_current(cache_path, _US_TZ, (_US_SESSION_OPEN, _US_SESSION_SETTLED)):
+                    df = self._load_cache(cache_path)
+                if df is None:
+                    try:
+                        df = ak.stock_us_daily(symbol=symbol, adjust=adjust)
+                    except Exception as e:
+                        print(f"Akshare US fetch error: {e}")
+                        return None
+                    if df is not None and not df.empty:
+                        self._save_cache(cache_path, df)
                 
                 if df is not None and not df.empty:
                     # 统一列名
@@ -114,10 +393,16 @@ class DataFetcher:
                         'close': 'close', 'volume': 'volume'
                     }, inplace=True)
                     
-                    # 过滤日期范围
+                    # 过滤日期范围: 日期有序，二分查找区间端点代替整列布尔掩码
                     df['date'] = pd.to_datetime(df['date'])
-                    mask = (df['date'] >= start_date) & (df['date'] <= end_date)
-                    df = df.loc[mask].copy()
+                    if not df['date'].is_monotonic_increasing:
+                        df.sort_values('date', inplace=True)
+                    dates = df['date'].to_numpy(dtype='datetime64[ns]')
+                    # (start_iso, end_iso]: 起始日当天不含，与原先按当前时刻比较的结果一致
+                    i0 = np.searchsorted(dates, np.datetime64(start_iso, 'ns'), side='right')
+                    i1 = np.searchsorted(dates, np.datetime64(end_iso, 'ns'), side='right')
+                    # 只复制窗口内的行 (后续会写列，pandas 2.x 下切片视图会触发 SettingWithCopy)
+                    df = df.iloc[i0:i1].copy()
 
                     # 处理美股的周K/月K重采样 (Resampling)
                     if period in ['weekly', 'monthly']:
@@ -145,7 +430,7 @@ class DataFetcher:
                         df_resampled.dropna(subset=['open', 'close'], inplace=True) # 移除无交易数据的周期
                         
                         # 重算涨跌幅
-                        df_resampled['change_pct'] = df_resampled['close'].pct_change() * 100
+                        df_resampled['change_pct'] = _change_pct(df_resampled['close'])
                         
                         # 重置索引，让 date 变回列
                         df = df_resampled.reset_index()
@@ -155,52 +440,99 @@ class DataFetcher:
                     
                     # 补充缺失字段
                     if 'amount' not in df.columns: df['amount'] = df['volume'] * df['close']
-                    if 'change_pct' not in df.columns: df['change_pct'] = df['close'].pct_change() * 100
+                    if 'change_pct' not in df.columns: df['change_pct'] = _change_pct(df['close'])
 
             else:
                 # === A股接口 (Method A: Eastmoney / ak.stock_zh_a_hist) ===
                 # Primary source, usually fastest and most detailed
-                try:
-                    df = ak.stock_zh_a_hist(
-                        symbol=symbol,
-                        period=period,
-                        start_date=start_date_str,
-                        end_date=end_date_str,
-                        adjust=adjust
-                    )
-                except Exception as e:
-                    print(f"Akshare CN (Eastmoney) fetch error: {e}")
-                    df = None
+                # 本地缓存覆盖请求起点时，只增量拉取最后一根已完成K线之后的数据
+                cache_path = self._cache_path(symbol, period, adjust)
+                cached = self._load_cache(cache_path)
+                # 请求起点可能落在周末/长假 (或月K的月中)，缓存首根K线允许晚于起点若干天
+                cover_iso = (datetime.strptime(start_iso, '%Y-%m-%d')
+                             + timedelta(days=_CACHE_START_SLACK.get(period, 10))).strftime('%Y-%m-%d')
+                if cached is not None and (cached.empty or cached['date'].iloc[0] > cover_iso):
+                    cached = None
+                fetch_start_str = start_date_str
+                anchor_date = anchor_close = None
+                if cached is not None:
+                    if self._cache_is_current(cache_path):
+                        df = cached
+                    else:
+                        # 锚点 = 最后一根已完成的K线: 从它开始拉取，既刷新其后的K线
+                        # (含盘中未完成的那根)，也用于校验复权是否变化
+                        pos = -1 if self._last_bar_final(cache_path, cached, period) or len(cached) < 2 else -2
+                        anchor_date = cached['date'].iloc[pos]
+                        anchor_close = float(cached['close'].iloc[pos])
+                        fetch_start_str = anchor_date.replace('-', '')
 
-                if df is not None and not df.empty:
-                    # 统一列名
-                    # Eastmoney returns Chinese columns, Sina returns English.
-                    # We use a safe rename that ignores missing keys.
-                    rename_map = {
-                        '日期': 'date', '股票代码': 'code', '开盘': 'open', '收盘': 'close', 
-                        '最高': 'high', '最低': 'low', '成交量': 'volume', '成交额': 'amount', 
-                        '振幅': 'amplitude', '涨跌幅': 'change_pct', '涨跌额': 'change', 
-                        '换手率': 'turnover'
-                    }
-                    # Only rename columns that exist
-                    df.rename(columns=rename_map, inplace=True)
+                if df is None:
+                    try:
+                        fresh = ak.stock_zh_a_hist(
+                            symbol=symbol,
+                            period=period,
+                            start_date=fetch_start_str,
+                            end_date=end_date_str,
+                            adjust=adjust
+                        )
+                    except Exception as e:
+                        print(f"Akshare CN (Eastmoney) fetch error: {e}")
+                        fresh = None
+
+                    if fresh is not None and not fresh.empty:
+                        # 统一列名
+                        # Eastmoney returns Chinese columns, Sina returns English.
+                        # We use a safe rename that ignores missing keys.
+                        rename_map = {
+                            '日期': 'date', '股票代码': 'code', '开盘': 'open', '收盘': 'close', 
+                            '最高': 'high', '最低': 'low', '成交量': 'volume', '成交额': 'amount', 
+                            '振幅': 'amplitude', '涨跌幅': 'change_pct', '涨跌额': 'change', 
+                            '换手率': 'turnover'
+                        }
+                        # Only rename columns that exist
+                        fresh.rename(columns=rename_map, inplace=True)
+                        # Eastmoney 的日期列为 date 对象，统一转成 YYYY-MM-DD 字符串 (缓存中已是字符串)
+                        if not isinstance(fresh['date'].iloc[0], str):
+                            fresh['date'] = pd.to_datetime(fresh['date']).dt.strftime('%Y-%m-%d')
+                        df = fresh
+                        # 锚点之后的缓存K线可能未完成，由新数据替换
+                        merge_cache = cached.loc[cached['date'] <= anchor_date] if cached is not None else None
+                    elif cached is not None:
+                        print("[Info] Incremental fetch failed, using cached data.")
+                        df = cached
+                else:
+                    print(f"[Info] Cache hit for {symbol}, skipping network fetch.")
 
             # === 通用数据清洗 ===
             if df is None or df.empty:
                 print(f"[!] Data for {symbol} is empty. Check symbol or network.")
                 return None
 
-            # 确保数值列为 float 类型
-            numeric_cols = ['open', 'close', 'high', 'low', 'volume', 'amount']
-            for col in numeric_cols:
-                if col in df.columns:
+            # 确保数值列为 float 类型 (一次 astype; 含非数字脏值时逐列 coerce 为 NaN)
+            present = {k: v for k, v in _NUMERIC_DTYPES.items() if k in df.columns}
+            try:
+                df = df.astype(present, copy=False)
+            except (ValueError, TypeError):
+                for col in present:
                     df[col] = pd.to_numeric(df[col], errors='coerce')
 
-            # 确保 date 是字符串 (YYYY-MM-DD)
-            if not df.empty and 'date' in df.columns:
-                first_date = df['date'].iloc[0]
-                if not isinstance(first_date, str):
-                     df['date'] = df['date'].apply(lambda x: x.strftime('%Y-%m-%d') if hasattr(x, 'strftime') else str(x))
+            # === A股缓存合并与写回 ===
+            if not is_us_stock:
+                if merge_cache is not None:
+                    overlap = df.loc[df['date'] == anchor_date, 'close']
+                    if overlap.empty or abs(float(overlap.iloc[0]) - anchor_close) > 1e-6:
+                        # 复权价格已变 (除权除息)，缓存作废，全量重新拉取
+                        print("[Info] Cached prices no longer match (re-adjusted), refetching full range.")
+                        self._drop_cache(cache_path)
+                        return self.get_stock_data(symbol, days, adjust, period)
+                    df = pd.concat([merge_cache, df], ignore_index=True)
+                    df.drop_duplicates('date', keep='last', inplace=True)
+                    df.reset_index(drop=True, inplace=True)
+                if merge_cache is not None or cached is None:
+                    self._save_cache(cache_path, df)
+                # 缓存可能比本次请求覆盖更长的历史，只返回请求区间
+                if df['date'].iloc[0] < start_iso:
+                    df = df.loc[df['date'] >= start_iso].reset_index(drop=True)
 
             print(f"[OK] Successfully fetched {len(df)} rows")
             return df
@@ -214,9 +546,19 @@ class DataFetcher:
         Fetch stock basic info (Name, Code).
         """
         # 美股直接返回代码
-        if not symbol.isdigit():
+        if not _is_a_share(symbol):
              return {'code': symbol, 'name': symbol}
 
+        # A股: 先查当日缓存的代码-名称表 (Method 0)
+        # 只读已加载/已落盘的表，不在这里触发全量下载 (全量下载留给 get_stock_list)
+        try:
+            _, code_map = _load_code_name_table(download=False)
+            name = code_map.get(symbol)
+            if name:
+                return {'code': symbol, 'name': name}
+        except Exception as e:
+            print(f"[!] Name lookup error (code table): {e}")
+
         # A股: 尝试使用个股详情接口 (Method 1)
         # 这个接口只查询单只股票，速度快，不查全量列表
         try:
@@ -241,7 +583,7 @@ class DataFetcher:
         Get list of supported stocks (A-Share only).
         """
         try:
-            return ak.stock_info_a_code_name()
+            return _load_code_name_table()[0]
         except Exception as e:
             print(f"[!] List fetch error: {e}")
             return pd.DataFrame()
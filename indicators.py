@@ -3,11 +3,117 @@ Technical Indicators Module
 计算各类技术指标
 """
 
+import math
+from collections import namedtuple
 import talib
+from talib import abstract
 import pandas as pd
 import numpy as np
 from typing import Dict
 from config import INDICATOR_PARAMS
+from numba_compat import njit, F8_RO, HAVE_NUMBA
+
+
+# DMI 族 (+DI/-DI/ADX/ADXR) 共享 TR 与 ±DM，分开调 4 次 talib 会重复计算 4 遍。
+# 不开 fastmath (FMA 收缩会改变末位)，结果与 talib 逐位一致。
+@njit('boolean(float64)', cache=True, nogil=True)
+def _ta_is_zero(v):
+    # TA-Lib 的 TA_IS_ZERO 宏
+    return -0.00000001 < v < 0.00000001
+
+
+@njit(f'UniTuple(float64[:], 4)({F8_RO}, {F8_RO}, {F8_RO}, int64)', cache=True, nogil=True)
+def _dmi_bundle(high, low, close, period):
+    """一次遍历计算 +DI, -DI, ADX, ADXR (逐位复现 TA-Lib 的 Wilder 平滑与初始化)"""
+    n = high.shape[0]
+    plus_di = np.full(n, np.nan)
+    minus_di = np.full(n, np.nan)
+    adx = np.full(n, np.nan)
+    adxr = np.full(n, np.nan)
+
+    # 与 talib 封装一致: 从第一个 high/low/close 均非 NaN 的位置开始
+    begin = 0
+    while begin < n and (math.isnan(high[begin]) or math.isnan(low[begin]) or math.isnan(close[begin])):
+        begin += 1
+    if period < 2 or n - begin <= period:
+        return plus_di, minus_di, adx, adxr
+
+    prev_high = high[begin]
+    prev_low = low[begin]
+    prev_close = close[begin]
+    plus_dm = 0.0
+    minus_dm = 0.0
+    tr = 0.0
+    sum_dx = 0.0
+    prev_adx = 0.0
+
+    for today in range(begin + 1, n):
+        diff_p = high[today] - prev_high
+        diff_m = prev_low - low[today]
+        rng = high[today] - low[today]
+        t = abs(high[today] - prev_close)
+        if t > rng:
+            rng = t
+        t = abs(low[today] - prev_close)
+        if t > rng:
+            rng = t
+
+        k = today - begin
+        if k < period:
+            # 前 period-1 根: 直接累加
+            if diff_m > 0 and diff_p < diff_m:
+                minus_dm += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                plus_dm += diff_p
+            tr += rng
+        else:
+            # Wilder 平滑
+            minus_dm -= minus_dm / period
+            plus_dm -= plus_dm / period
+            if diff_m > 0 and diff_p < diff_m:
+                minus_dm += diff_m
+            elif diff_p > 0 and diff_p > diff_m:
+                plus_dm += diff_p
+            tr = tr - (tr / period) + rng
+
+            if not _ta_is_zero(tr):
+                p_di = 100.0 * (plus_dm / tr)
+                m_di = 100.0 * (minus_dm / tr)
+                plus_di[today] = p_di
+                minus_di[today] = m_di
+                s = m_di + p_di
+                if not _ta_is_zero(s):
+                    dx = 100.0 * (abs(m_di - p_di) / s)
+                    if k < 2 * period:
+                        sum_dx += dx
+                    else:
+                        prev_adx = ((prev_adx * (period - 1)) + dx) / period
+            else:
+                plus_di[today] = 0.0
+                minus_di[today] = 0.0
+
+            if k == 2 * period - 1:
+                prev_adx = sum_dx / period
+            if k >= 2 * period - 1:
+                adx[today] = prev_adx
+                if k >= 3 * period - 2:
+                    adxr[today] = (prev_adx + adx[today - (period - 1)]) / 2.0
+
+        prev_high = high[today]
+        prev_low = low[today]
+        prev_close = close[today]
+
+    return plus_di, minus_di, adx, adxr
+
+
+@njit(f'float64[:]({F8_RO}, {F8_RO}, {F8_RO})', cache=True, nogil=True, error_model='numpy')
+def _pct_b(close, upper, lower):
+    """%B = (close - lower) / (upper - lower) * 100，单次遍历，不产生中间数组"""
+    out = np.empty_like(close)
+    for i in range(close.shape[0]):
+        # 不加分支: 带宽为 0 时与 numpy 表达式一样得到 inf/NaN
+        out[i] = (close[i] - lower[i]) / (upper[i] - lower[i]) * 100
+    return out
 
 
 class TechnicalIndicators:
@@ -18,19 +124,23 @@ class TechnicalIndicators:
         初始化
 
         Args:
-            data: OHLCV数据
+            data: OHLCV数据 (DataFrame，或各列 float64 数组组成的 dict)
         """
         self.data = data
-        self.open = data['open'].astype(float).values
-        self.high = data['high'].astype(float).values
-        self.low = data['low'].astype(float).values
-        self.close = data['close'].astype(float).values
-        self.volume = data['volume'].astype(float).values
+        self.open = np.ascontiguousarray(data['open'], dtype=np.float64)
+        self.high = np.ascontiguousarray(data['high'], dtype=np.float64)
+        self.low = np.ascontiguousarray(data['low'], dtype=np.float64)
+        self.close = np.ascontiguousarray(data['close'], dtype=np.float64)
+        self.volume = np.ascontiguousarray(data['volume'], dtype=np.float64)
 
     def calculate_all(self) -> Dict:
-        """计算所有指标"""
+        """计算所有指标 (先算只依赖收盘价的指标，再算依赖高低收/成交量的指标)"""
+        # 直接调用 talib 的 Cython 封装。曾评估过在 @njit 驱动函数里通过 ctypes 调 TA_* C 函数，
+        # 但引用 ctypes 函数指针的 Numba 函数无法落盘缓存，每个进程都要重新 JIT 编译，
+        # 其耗时远超省下的约 30 次封装调用开销。
         indicators = {}
 
+        # --- 仅依赖 close ---
         # 1. 移动平均线
         indicators.update(self.calculate_ma())
 
@@ -40,12 +150,13 @@ class TechnicalIndicators:
         # 3. RSI
         indicators.update(self.calculate_rsi())
 
-        # 4. KDJ
-        indicators.update(self.calculate_kdj())
-
-        # 5. 布林带
+        # 4. 布林带
         indicators.update(self.calculate_bbands())
 
+        # --- 依赖 high/low/close/volume ---
+        # 5. KDJ
+        indicators.update(self.calculate_kdj())
+
         # 6. 波动率指标
         indicators.update(self.calculate_volatility())
 
@@ -62,15 +173,13 @@ class TechnicalIndicators:
 
     def calculate_ma(self) -> Dict:
         """计算移动平均线"""
-        result = {}
+        close = self.close
 
         # SMA
-        for period in INDICATOR_PARAMS['SMA']['periods']:
-            result[f'SMA_{period}'] = talib.SMA(self.close, timeperiod=period)
+        result = {f'SMA_{p}': talib.SMA(close, timeperiod=p) for p in INDICATOR_PARAMS['SMA']['periods']}
 
         # EMA
-        for period in INDICATOR_PARAMS['EMA']['periods']:
-            result[f'EMA_{period}'] = talib.EMA(self.close, timeperiod=period)
+        result.update({f'EMA_{p}': talib.EMA(close, timeperiod=p) for p in INDICATOR_PARAMS['EMA']['periods']})
 
         # WMA
         result['WMA_20'] = talib.WMA(self.close, timeperiod=20)
@@ -95,10 +204,8 @@ class TechnicalIndicators:
 
     def calculate_rsi(self) -> Dict:
         """计算RSI"""
-        result = {}
-        for period in INDICATOR_PARAMS['RSI']['periods']:
-            result[f'RSI_{period}'] = talib.RSI(self.close, timeperiod=period)
-        return result
+        close = self.close
+        return {f'RSI_{p}': talib.RSI(close, timeperiod=p) for p in INDICATOR_PARAMS['RSI']['periods']}
 
     def calculate_kdj(self) -> Dict:
         """计算KDJ"""
@@ -126,7 +233,10 @@ class TechnicalIndicators:
         )
 
         # 计算%B（价格在布林带中的位置）
-        pct_b = (self.close - lower) / (upper - lower) * 100
+        if HAVE_NUMBA:
+            pct_b = _pct_b(self.close, upper, lower)
+        else:
+            pct_b = (self.close - lower) / (upper - lower) * 100
 
         return {
             'BB_Upper': upper,
@@ -149,11 +259,14 @@ class TechnicalIndicators:
         """计算趋势指标"""
         adx_period = INDICATOR_PARAMS['ADX']['timeperiod']
 
-        # DMI/ADX
-        adx = talib.ADX(self.high, self.low, self.close, timeperiod=adx_period)
-        plus_di = talib.PLUS_DI(self.high, self.low, self.close, timeperiod=adx_period)
-        minus_di = talib.MINUS_DI(self.high, self.low, self.close, timeperiod=adx_period)
-        adxr = talib.ADXR(self.high, self.low, self.close, timeperiod=adx_period)
+        # DMI/ADX (有 numba 时一次遍历算完；纯 Python 循环比 talib 慢，无 numba 时仍用 talib)
+        if HAVE_NUMBA:
+            plus_di, minus_di, adx, adxr = _dmi_bundle(self.high, self.low, self.close, adx_period)
+        else:
+            adx = talib.ADX(self.high, self.low, self.close, timeperiod=adx_period)
+            plus_di = talib.PLUS_DI(self.high, self.low, self.close, timeperiod=adx_period)
+            minus_di = talib.MINUS_DI(self.high, self.low, self.close, timeperiod=adx_period)
+            adxr = talib.ADXR(self.high, self.low, self.close, timeperiod=adx_period)
 
         # TRIX
         trix = talib.TRIX(self.close, timeperiod=12)
@@ -234,6 +347,63 @@ class TechnicalIndicators:
         return latest
 
 
+# 形态识别只读取最后一根K线的结果；所用 CDL 函数的最大 lookback 为 13，
+# 取尾部 32 根足以保证 result[-1] 与全量计算一致，且不随历史长度增长。
+_PATTERN_TAIL = 32
+
+# 最后一根K线的廉价必要条件。颜色沿用 TA-Lib 定义: close >= open 为阳线 (1)，否则为阴线 (-1)；
+# 条件不满足时该形态在 result[-1] 上必为 0 (或方向不符)，可直接跳过 talib 调用。
+_TailBar = namedtuple('_TailBar', 'c2 c1 c0 body upper lower')
+
+
+def _long_lower(b):
+    return b.lower > b.body
+
+
+def _long_upper(b):
+    return b.upper > b.body
+
+
+def _long_both(b):
+    return b.upper > b.body and b.lower > b.body
+
+
+def _patterns(entries):
+    """(函数, 中文名, 前置检查) -> (函数, 中文名, lookback, 前置检查)"""
+    return tuple((func, name, abstract.Function(func.__name__).lookback, precheck)
+                 for func, name, precheck in entries)
+
+
+# 导入时解析一次
+_BULLISH_FUNCS = _patterns((
+    (talib.CDL3WHITESOLDIERS, '三白兵', lambda b: b.c2 == b.c1 == b.c0 == 1),
+    (talib.CDLMORNINGSTAR, '晨星', lambda b: b.c2 == -1 and b.c0 == 1),
+    (talib.CDLHAMMER, '锤子线', _long_lower),
+    (talib.CDLPIERCING, '刺穿形态', lambda b: b.c1 == -1 and b.c0 == 1),
+    (talib.CDLENGULFING, '吞没形态', lambda b: b.c1 == -1 and b.c0 == 1),
+    (talib.CDLHARAMI, '孕线', lambda b: b.c1 == -1),
+    (talib.CDL3INSIDE, '三内上升', lambda b: b.c2 == -1),
+    (talib.CDLINVERTEDHAMMER, '倒锤线', _long_upper),
+    (talib.CDLDRAGONFLYDOJI, '蜻蜓十字', None),
+))
+
+_BEARISH_FUNCS = _patterns((
+    (talib.CDL3BLACKCROWS, '三黑鸦', lambda b: b.c2 == b.c1 == b.c0 == -1),
+    (talib.CDLEVENINGSTAR, '黄昏星', lambda b: b.c2 == 1 and b.c0 == -1),
+    (talib.CDLHANGINGMAN, '上吊线', _long_lower),
+    (talib.CDLDARKCLOUDCOVER, '乌云盖顶', lambda b: b.c1 == 1 and b.c0 == -1),
+    (talib.CDLSHOOTINGSTAR, '流星', _long_upper),
+    (talib.CDL3OUTSIDE, '三外下降', lambda b: b.c1 == -1),
+    (talib.CDLGRAVESTONEDOJI, '墓碑十字', None),
+))
+
+_NEUTRAL_FUNCS = _patterns((
+    (talib.CDLDOJI, '十字星', None),
+    (talib.CDLSPINNINGTOP, '纺锤线', _long_both),
+    (talib.CDLHIGHWAVE, '高浪线', _long_both),
+))
+
+
 class PatternRecognizer:
     """K线形态识别器"""
 
@@ -242,12 +412,35 @@ class PatternRecognizer:
         初始化
 
         Args:
-            data: OHLCV数据
+            data: OHLCV数据 (DataFrame，或各列 float64 数组组成的 dict)
         """
-        self.open = data['open'].astype(float).values
-        self.high = data['high'].astype(float).values
-        self.low = data['low'].astype(float).values
-        self.close = data['close'].astype(float).values
+        # 只保留尾部窗口 (拷贝为连续数组，不引用完整历史)
+        tail = slice(-_PATTERN_TAIL, None)
+        self.open = np.ascontiguousarray(np.asarray(data['open'], dtype=np.float64)[tail])
+        self.high = np.ascontiguousarray(np.asarray(data['high'], dtype=np.float64)[tail])
+        self.low = np.ascontiguousarray(np.asarray(data['low'], dtype=np.float64)[tail])
+        self.close = np.ascontiguousarray(np.asarray(data['close'], dtype=np.float64)[tail])
+        self.n = len(self.close)
+        self.bar = self._tail_bar() if self.n >= 3 else None
+
+    def _tail_bar(self) -> _TailBar:
+        """最后三根K线的颜色，以及最后一根的实体/上影线/下影线长度"""
+        o2, o1, o0 = self.open[-3:].tolist()
+        c2, c1, c0 = self.close[-3:].tolist()
+        top = max(o0, c0)
+        bottom = min(o0, c0)
+        return _TailBar(
+            1 if c2 >= o2 else -1,
+            1 if c1 >= o1 else -1,
+            1 if c0 >= o0 else -1,
+            abs(c0 - o0),
+            float(self.high[-1]) - top,
+            bottom - float(self.low[-1]),
+        )
+
+    def _applicable(self, lookback: int, precheck) -> bool:
+        """数据长度不超过 lookback 或前置检查不通过时，该形态在最后一根必不成立"""
+        return self.n > lookback and (precheck is None or precheck(self.bar))
 
     def detect_all_patterns(self) -> Dict:
         """检测所有形态"""
@@ -271,20 +464,9 @@ class PatternRecognizer:
         """检测看涨形态"""
         patterns = {}
 
-        bullish_funcs = {
-            'CDL3WHITESOLDIERS': '三白兵',
-            'CDLMORNINGSTAR': '晨星',
-            'CDLHAMMER': '锤子线',
-            'CDLPIERCING': '刺穿形态',
-            'CDLENGULFING': '吞没形态',
-            'CDLHARAMI': '孕线',
-            'CDL3INSIDE': '三内上升',
-            'CDLINVERTEDHAMMER': '倒锤线',
-            'CDLDRAGONFLYDOJI': '蜻蜓十字',
-        }
-
-        for func_name, chinese_name in bullish_funcs.items():
-            func = getattr(talib, func_name)
+        for func, chinese_name, lookback, precheck in _BULLISH_FUNCS:
+            if not self._applicable(lookback, precheck):
+                continue
             result = func(self.open, self.high, self.low, self.close)
 
             if result[-1] > 0:
@@ -300,18 +482,9 @@ class PatternRecognizer:
         """检测看跌形态"""
         patterns = {}
 
-        bearish_funcs = {
-            'CDL3BLACKCROWS': '三黑鸦',
-            'CDLEVENINGSTAR': '黄昏星',
-            'CDLHANGINGMAN': '上吊线',
-            'CDLDARKCLOUDCOVER': '乌云盖顶',
-            'CDLSHOOTINGSTAR': '流星',
-            'CDL3OUTSIDE': '三外下降',
-            'CDLGRAVESTONEDOJI': '墓碑十字',
-        }
-
-        for func_name, chinese_name in bearish_funcs.items():
-            func = getattr(talib, func_name)
+        for func, chinese_name, lookback, precheck in _BEARISH_FUNCS:
+            if not self._applicable(lookback, precheck):
+                continue
             result = func(self.open, self.high, self.low, self.close)
 
             if result[-1] < 0:
@@ -327,14 +500,9 @@ class PatternRecognizer:
         """检测中性形态"""
         patterns = {}
 
-        neutral_funcs = {
-            'CDLDOJI': '十字星',
-            'CDLSPINNINGTOP': '纺锤线',
-            'CDLHIGHWAVE': '高浪线',
-        }
-
-        for func_name, chinese_name in neutral_funcs.items():
-            func = getattr(talib, func_name)
+        for func, chinese_name, lookback, precheck in _NEUTRAL_FUNCS:
+            if not self._applicable(lookback, precheck):
+                continue
             result = func(self.open, self.high, self.low, self.close)
 
             if result[-1] != 0:
@@ -0,0 +1,26 @@
+"""
+Optional Numba support.
+
+`njit` resolves to numba.njit when numba is installed; otherwise it is a
+no-op decorator so the kernels run as plain Python loops.
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+# Signature fragment for 1-D float64 kernel inputs. Declared read-only so the
+# same compiled kernel accepts both writable arrays and the read-only views
+# pandas hands out under copy-on-write.
+F8_RO = "Array(float64, 1, 'A', readonly=True)"
+
+# fastmath flags safe for the kernels in this project. 'nnan'/'ninf' are left
+# out because the kernels rely on explicit isnan checks, and 'reassoc' because
+# it would let LLVM fold away Kahan compensation terms.
+FASTMATH = {'nsz', 'arcp', 'contract', 'afn'}
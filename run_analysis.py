@@ -1,89 +1,169 @@
 
 import sys
 import os
-import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from typing import Dict, List, Optional
 from analyzer import StockAnalyzer
 
 def save_text_report(analyzer, filepath):
     """Generate a readable text report."""
-    with open(filepath, 'w', encoding='utf-8') as f:
+    info = analyzer.stock_info
+    price = analyzer.get_price_info()
+    score = analyzer.综合评分
+    inds = analyzer.get_key_indicators()
+    extra = analyzer.extra_indicators
+    rule = "="*50 + "\n"
+
+    # Assemble the whole report, then write it in one go
+    parts = [
         # Header
-        info = analyzer.stock_info
-        price = analyzer.get_price_info()
-        score = analyzer.综合评分
-        
-        f.write("="*50 + "\n")
-        f.write(f"  STOCK ANALYSIS REPORT: {info.get('name')} ({info.get('code')})\n")
-        f.write(f"  Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
-        f.write("="*50 + "\n\n")
-        
+        rule,
+        f"  STOCK ANALYSIS REPORT: {info.get('name')} ({info.get('code')})\n",
+        f"  Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n",
+        rule + "\n",
+
         # Price Section
-        f.write(f"1. MARKET DATA\n")
-        f.write(f"   Price:  {price.get('close')}\n")
-        f.write(f"   Change: {price.get('change_pct'):.2f}%\n")
-        f.write(f"   Volume: {price.get('volume'):,.0f}\n")
-        f.write(f"   Trend:  {score.get('regime', 'N/A').upper()}\n\n")
-        
+        "1. MARKET DATA\n",
+        f"   Price:  {price.get('close')}\n",
+        f"   Change: {price.get('change_pct'):.2f}%\n",
+        f"   Volume: {price.get('volume'):,.0f}\n",
+        f"   Trend:  {score.get('regime', 'N/A').upper()}\n\n",
+
         # Score Section
-        f.write(f"2. TECHNICAL SCORE\n")
-        f.write(f"   Total Score:    {score.get('score'):.1f} / 100\n")
-        f.write(f"   Recommendation: {score.get('recommendation')}\n")
-        f.write(f"   Buy Signals:    {score.get('buy_signals')}\n")
-        f.write(f"   Sell Signals:   {score.get('sell_signals')}\n\n")
-        
+        "2. TECHNICAL SCORE\n",
+        f"   Total Score:    {score.get('score'):.1f} / 100\n",
+        f"   Recommendation: {score.get('recommendation')}\n",
+        f"   Buy Signals:    {score.get('buy_signals')}\n",
+        f"   Sell Signals:   {score.get('sell_signals')}\n\n",
+
         # Key Indicators
-        f.write(f"3. KEY INDICATORS\n")
-        inds = analyzer.get_key_indicators()
-        f.write(f"   RSI (14):    {inds.get('RSI_14'):.2f}\n")
-        f.write(f"   MACD:        {inds.get('MACD'):.3f}\n")
-        f.write(f"   KDJ (K/D/J): {inds.get('K'):.1f} / {inds.get('D'):.1f} / {inds.get('J'):.1f}\n")
-        
-        # Advanced Indicators
-        extra = analyzer.extra_indicators
-        if extra:
-             f.write(f"   SuperTrend:  {extra.get('SuperTrend')[-1]:.2f} (Dir: {extra.get('ST_Direction')[-1]})\n")
-             f.write(f"   VWMA:        {extra.get('VWMA')[-1]:.2f}\n")
-        
-        # Active Signals
-        f.write(f"\n4. ACTIVE SIGNALS\n")
-        for name, sig in analyzer.signals.items():
-            if sig.get('signal') != 'neutral' and sig.get('signal') != 'N/A':
-                arrow = "↑ BUY" if sig['signal'] == 'buy' else "↓ SELL"
-                f.write(f"   [{arrow}] {name:<15} | Strength: {sig.get('strength')} | {sig.get('description')}\n")
-        
-        f.write("\n" + "="*50 + "\n")
+        "3. KEY INDICATORS\n",
+        f"   RSI (14):    {inds.get('RSI_14'):.2f}\n",
+        f"   MACD:        {inds.get('MACD'):.3f}\n",
+        f"   KDJ (K/D/J): {inds.get('K'):.1f} / {inds.get('D'):.1f} / {inds.get('J'):.1f}\n",
+    ]
+
+    # Advanced Indicators
+    if extra:
+        parts.append(f"   SuperTrend:  {extra.get('SuperTrend')[-1]:.2f} (Dir: {extra.get('ST_Direction')[-1]})\n")
+        parts.append(f"   VWMA:        {extra.get('VWMA')[-1]:.2f}\n")
+
+    # Active Signals
+    parts.append("\n4. ACTIVE SIGNALS\n")
+    for name, sig in analyzer.signals.items():
+        kind = sig.get('signal')
+        if kind != 'neutral' and kind != 'N/A':
+            arrow = "↑ BUY" if kind == 'buy' else "↓ SELL"
+            parts.append(f"   [{arrow}] {name:<15} | Strength: {sig.get('strength')} | {sig.get('description')}\n")
+
+    parts.append("\n" + rule)
+
+    with open(filepath, 'w', encoding='utf-8', buffering=1 << 16) as f:
+        f.write(''.join(parts))
+
+def save_reports(analyzer, symbol, period):
+    """Write the JSON + text reports for one analyzed symbol; returns the base path."""
+    os.makedirs('output', exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    base_path = os.path.join('output', f"{symbol}_{period}_{timestamp}")
+    
+    # 1. Save JSON (Raw Data)
+    analyzer.export_to_json(f"{base_path}.json")
+    
+    # 2. Save Text Report (Readable)
+    save_text_report(analyzer, f"{base_path}.txt")
+    return base_path
+
+def _analyze_one(symbol, days, period, use_proxy):
+    """Batch worker: analyze one symbol in a child process and save its reports.
+
+    Only a small summary dict goes back to the parent, not the analyzer itself.
+    """
+    analyzer = StockAnalyzer(use_proxy=use_proxy)
+    if not analyzer.analyze(symbol, days=days, period=period):
+        return {'symbol': symbol, 'ok': False, 'error': analyzer.last_error}
+
+    base_path = save_reports(analyzer, symbol, period)
+    score = analyzer.综合评分
+    price = analyzer.get_price_info()
+    return {
+        'symbol': symbol,
+        'ok': True,
+        'name': analyzer.stock_info.get('name'),
+        'close': price['close'],
+        'change_pct': price['change_pct'],
+        'score': score['score'],
+        'recommendation': score['recommendation'],
+        'regime': score['regime'],
+        'base_path': base_path,
+    }
+
+def run_batch(symbols: List[str], days: int = 150, period: str = 'daily',
+              use_proxy: bool = False, workers: Optional[int] = None) -> List[Dict]:
+    """Analyze several symbols in parallel worker processes.
+
+    Indicator/signal work is CPU-bound (TA-Lib + numpy), so processes rather than
+    threads are used. Results are returned in the order of `symbols`.
+    """
+    symbols = list(dict.fromkeys(symbols))  # duplicates would only redo the same work
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(symbols))) as ex:
+        futures = {ex.submit(_analyze_one, sym, days, period, use_proxy): sym for sym in symbols}
+        results = {}
+        for fut in as_completed(futures):
+            sym = futures[fut]
+            try:
+                res = fut.result()
+            except Exception as e:  # a crashed worker only loses its own symbol
+                res = {'symbol': sym, 'ok': False, 'error': str(e)}
+            results[sym] = res
+            print(f"  [{'OK' if res['ok'] else '!!'}] {sym}")
+    return [results[sym] for sym in symbols]
+
+def print_batch_summary(results):
+    print("\n" + "="*60)
+    print(f"  BATCH RESULT ({len(results)} symbols, ranked by score)")
+    print("="*60)
+    ok = sorted((r for r in results if r['ok']), key=lambda r: r['score'], reverse=True)
+    for r in ok:
+        print(f"  {r['symbol']:<8} {str(r['name']):<10} {r['score']:6.1f}  {r['recommendation']:<10} "
+              f"{r['close']} ({r['change_pct']:.2f}%)  {r['regime']}")
+    for r in results:
+        if not r['ok']:
+            print(f"  {r['symbol']:<8} [!] {r['error']}")
+    print("="*60 + "\n")
 
 def main():
     parser = argparse.ArgumentParser(description='Run Stock Technical Analysis (Backend)')
-    parser.add_argument('symbol', type=str, help='Stock Code (e.g. 600000)')
+    parser.add_argument('symbols', type=str, nargs='+', help='Stock Code(s) (e.g. 600000); several codes run as a batch')
     parser.add_argument('--period', type=str, default='daily', choices=['daily', 'weekly', 'monthly'], help='Timeframe')
     parser.add_argument('--days', type=int, default=150, help='Days of history to fetch')
     parser.add_argument('--proxy', action='store_true', help='Enable default proxy if configured')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for batch runs (default: CPU count)')
     
     args = parser.parse_args()
-    
-    print(f"\nAnalyzing {args.symbol} ({args.period})...")
+
+    if len(args.symbols) > 1:
+        print(f"\nAnalyzing {len(args.symbols)} symbols ({args.period})...")
+        results = run_batch(args.symbols, days=args.days, period=args.period,
+                            use_proxy=args.proxy, workers=args.workers)
+        print_batch_summary(results)
+        return
+
+    symbol = args.symbols[0]
+    print(f"\nAnalyzing {symbol} ({args.period})...")
     
     # Initialize Analyzer
     # Note: use_proxy=False is default in our clean architecture, but kept for compatibility
     analyzer = StockAnalyzer(use_proxy=args.proxy)
     
-    if not analyzer.analyze(args.symbol, days=args.days, period=args.period):
+    if not analyzer.analyze(symbol, days=args.days, period=args.period):
         print("[!] Analysis Failed. Check network connection or stock code.")
         return
 
-    # Create Output Directory
-    os.makedirs('output', exist_ok=True)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    base_path = os.path.join('output', f"{args.symbol}_{args.period}_{timestamp}")
-    
-    # 1. Save JSON (Raw Data)
-    analyzer.export_to_json(f"{base_path}.json")
-    
-    # 2. Save Text Report (Readable)
-    save_text_report(analyzer, f"{base_path}.txt")
+    base_path = save_reports(analyzer, symbol, args.period)
     
     # 3. Print Summary to Console
     info = analyzer.stock_info
@@ -91,7 +171,7 @@ def main():
     price = analyzer.get_price_info()
     
     print("\n" + "="*40)
-    print(f"  RESULT: {info['name']} ({args.symbol})")
+    print(f"  RESULT: {info['name']} ({symbol})")
     print("="*40)
     print(f"  Price:  {price['close']} ({price['change_pct']:.2f}%)")
     print(f"  Score:  {score['score']:.1f} -> {score['recommendation']}")
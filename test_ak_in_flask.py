@@ -2,7 +2,8 @@
 from flask import Flask
 import akshare as ak
 import sys
-import os
+
+import data_fetcher  # installs the shared akshare session (env proxies are not consulted per request)
 
 # Create a minimal Flask app context
 app = Flask(__name__)
@@ -11,15 +12,9 @@ def fetch_data():
     print("Testing akshare inside Flask context...")
     with app.app_context():
         try:
-            # Mimic exactly what DataFetcher does now (clearing proxies)
-            old_proxies = {}
-            proxy_vars = ['HTTP_PROXY', 'HTTPS_PROXY', 'http_proxy', 'https_proxy', 'ALL_PROXY', 'all_proxy']
-            for var in proxy_vars:
-                if var in os.environ:
-                    old_proxies[var] = os.environ[var]
-                    del os.environ[var]
-            os.environ['NO_PROXY'] = '*'
-            
+            # Same network path as DataFetcher: the shared session decides the proxy,
+            # os.environ is not touched
+            print(f"Session proxies: {data_fetcher._SESSION.proxies}")
             print("Fetching data for 688766...")
             df = ak.stock_zh_a_hist(symbol="688766", period="daily", start_date="20250101", end_date="20251119", adjust="qfq")
             print(f"Success! Got {len(df)} rows.")
@@ -1,5 +1,6 @@
 """Flask web UI for Stock Technical Analyzer (ASCII-safe)
 - API: /analyze returns structured analysis with OHLCV & advanced indicators
+- API: /analyze_batch (POST {"symbols": [...], "period": ...}) runs /analyze for several symbols concurrently
 - API: /export_pdf generates PDF with chart (SuperTrend/Ichimoku overlays)
 """
 
@@ -11,20 +12,38 @@ except Exception:
     pass
 
 from flask import Flask, render_template, request, jsonify, send_file
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+import functools
+import io
 import os
-import tempfile
+import re
 import shutil
-import numpy as np
+import threading
+import time
 
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to Flask's jsonify
+    orjson = None
+
 # PDF reporting is disabled for local testing.
 HAVE_REPORT = False
 
+# Chart/PDF libraries, bound by _ensure_report() on the first export
+mpf = canvas = A4 = cm = ImageReader = None
+
 # Configure Chinese Fonts
 CHINESE_FONT = 'Helvetica'  # Default fallback
 
+# Report chart: fixed figure size so a single render pass is enough
+# (110 dpi at 12in is still sharp at A4 width)
+CHART_FIGSIZE = (12, 6)
+CHART_DPI = 110
+
 
 app = Flask(__name__, static_folder='static', static_url_path='')
 CORS(app)  # Enable CORS for all routes
@@ -34,6 +53,83 @@ os.makedirs('output', exist_ok=True)
 os.makedirs('static', exist_ok=True)
 
 
+# Finished /analyze payloads, keyed by (symbol, period, days). Repeat requests
+# within the TTL skip the analyzer and the response build entirely. After the
+# TTL the analysis runs again; if it saw the same bars (see _bars_signature),
+# the cached payload is reused and only the response build is skipped.
+ANALYZE_TTL = 60
+ANALYZE_CACHE_SIZE = 256
+_analyze_lock = threading.Lock()
+_analyze_cache = OrderedDict()  # key -> (timestamp, bars signature, result)
+
+
+# /stock_list payload; the A-share listing changes at most daily
+STOCK_LIST_TTL = 3600
+STOCK_LIST_SIZE = 100
+_stock_list_lock = threading.Lock()
+_stock_list_cache = {'ts': 0.0, 'data': None}
+
+# A-share dates arrive as YYYYMMDD; the API returns YYYY-MM-DD
+_YYYYMMDD_RE = re.compile(r'^(\d{4})(\d{2})(\d{2})\Z')
+
+# /analyze_batch limits
+MAX_BATCH_SYMBOLS = 20
+BATCH_WORKERS = 8
+
+
+def _analyze_cache_get(key):
+    with _analyze_lock:
+        hit = _analyze_cache.get(key)
+        if hit is not None:
+            _analyze_cache.move_to_end(key)
+        return hit
+
+
+_SIGNATURE_COLS = ('open', 'high', 'low', 'close', 'volume', 'amount')
+
+
+def _bars_signature(analyzer):
+    """
+    Cheap check that a fresh analysis saw the same bars: row count, name, the whole
+    last bar (an intraday bar can move in any column) and the first close (a qfq
+    re-adjustment rewrites history while leaving the last bar alone).
+    """
+    src = analyzer.data
+    name = (analyzer.stock_info or {}).get('name')
+    if src is None or len(src) == 0:
+        return (0, name)
+    cols = [c for c in _SIGNATURE_COLS if c in src.columns]
+    # NaN != NaN would make a bar with a missing field never match itself
+    last = tuple(None if v != v else v for v in src[cols].iloc[-1].astype(float).tolist())
+    first_close = float(src['close'].iloc[0])
+    return (len(src), name, str(src['date'].iloc[-1]), last,
+            None if first_close != first_close else first_close)
+
+
+def _analyze_cache_put(key, signature, result):
+    with _analyze_lock:
+        _analyze_cache[key] = (time.time(), signature, result)
+        _analyze_cache.move_to_end(key)
+        while len(_analyze_cache) > ANALYZE_CACHE_SIZE:
+            _analyze_cache.popitem(last=False)
+
+
+def _json(obj, status=200):
+    """JSON response for the large /analyze payloads, encoded with orjson when available."""
+    if orjson is None:
+        return jsonify(obj), status
+    body = orjson.dumps(obj, default=_orjson_default,
+                        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+def _orjson_default(o):
+    """Fallback for arrays orjson cannot write natively (non-contiguous or object dtype)."""
+    if hasattr(o, 'tolist'):
+        return o.tolist()
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+
 @app.errorhandler(500)
 def internal_error(error):
     import traceback
@@ -45,6 +141,92 @@ def index():
     return send_file(os.path.join('static', 'index.html'))
 
 
+def _history_days(period):
+    # Use longer history for weekly/monthly
+    days = 400
+    if period == 'weekly': days = 500
+    if period == 'monthly': days = 2000
+    return days
+
+
+def _analyze_one(symbol, period, days):
+    """Analyze one symbol for /analyze and /analyze_batch; returns (payload, HTTP status)."""
+    cache_key = (symbol, period, days)
+    cached = _analyze_cache_get(cache_key)
+    if cached is not None and time.time() - cached[0] < ANALYZE_TTL:
+        return cached[2], 200
+
+    try:
+        import numpy as np
+        from analyzer import StockAnalyzer
+    except Exception as e:
+        return {'error': f'Missing backend dependency (maybe TA-Lib/akshare): {e}'}, 500
+
+    analyzer = StockAnalyzer(use_proxy=True)
+    if not analyzer.analyze(symbol, days=days, period=period):
+        error_msg = analyzer.last_error or 'Analysis failed, check symbol or network'
+        print(f"[Error] /analyze failed for {symbol}: {error_msg}")
+        return {'error': error_msg}, 400
+
+    signature = _bars_signature(analyzer)
+    if cached is not None and cached[1] == signature:
+        # Same bars as the cached payload, so nothing in it can have changed
+        _analyze_cache_put(cache_key, signature, cached[2])
+        return cached[2], 200
+
+    # orjson writes numpy arrays/scalars natively and NaN/Infinity as null, so
+    # the payload can go out as is. Without it (jsonify), arrays are cleaned
+    # with one isfinite pass each and the rest by the recursive cleaner
+    if orjson is not None:
+        to_json_array = to_json = lambda v: v
+    else:
+        to_json_array, to_json = _to_safe_list, _clean_nan_values
+
+    # OHLCV for charting
+    try:
+        ohlcv = []
+        src = analyzer.data
+        if src is not None and len(src) > 0:
+            # Column-wise build: reformat YYYYMMDD dates as one regex replace, cast
+            # the price columns once, then let pandas emit the row dicts
+            dates = src['date'].astype(str).str.replace(_YYYYMMDD_RE, r'\1-\2-\3', regex=True)
+            has_volume = 'volume' in src.columns
+            cols = ['open', 'high', 'low', 'close'] + (['volume'] if has_volume else [])
+            frame = src[cols].astype(float)
+            if orjson is None:
+                bad = ~np.isfinite(frame.to_numpy())
+                if bad.any():
+                    frame = frame.astype(object).mask(bad, None)
+            frame.insert(0, 'date', dates)
+            if not has_volume:
+                frame['volume'] = None
+            ohlcv = frame.to_dict('records')
+
+        adv_raw = getattr(analyzer, 'extra_indicators', {}) or {}
+        adv_safe = {
+            k: to_json_array(v) if isinstance(v, np.ndarray) else to_json(v)
+            for k, v in adv_raw.items()
+        }
+
+        result = to_json({
+            'stock_info': analyzer.stock_info,
+            'price_info': analyzer.get_price_info(),
+            'key_indicators': analyzer.get_key_indicators(),
+            'ma_levels': analyzer.get_ma_levels(),
+            'patterns': analyzer.patterns,
+            'signals': analyzer.signals,
+            'comprehensive_score': analyzer.综合评分,
+        })
+        result['advanced_indicators'] = adv_safe
+        result['ohlcv'] = ohlcv
+        _analyze_cache_put(cache_key, signature, result)
+        return result, 200
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return {'error': 'Serialization Error', 'details': str(e)}, 500
+
+
 @app.route('/analyze', methods=['GET', 'POST'])
 def analyze():
     try:
@@ -59,78 +241,49 @@ def analyze():
         if not symbol:
             return jsonify({'error': 'Please enter a stock symbol'}), 400
 
-        try:
-            from analyzer import StockAnalyzer
-        except Exception as e:
-            return jsonify({'error': f'Missing backend dependency (maybe TA-Lib/akshare): {e}'}), 500
-
-        analyzer = StockAnalyzer(use_proxy=True)
-        # Use longer history for weekly/monthly
-        days = 400
-        if period == 'weekly': days = 500
-        if period == 'monthly': days = 2000
-        
-        if not analyzer.analyze(symbol, days=days, period=period):
-            error_msg = analyzer.last_error or 'Analysis failed, check symbol or network'
-            print(f"[Error] /analyze failed for {symbol}: {error_msg}")
-            return jsonify({'error': error_msg}), 400
-
-        # OHLCV for charting
-        try:
-            ohlcv = []
-            if analyzer.data is not None and len(analyzer.data) > 0:
-                for _, row in analyzer.data.iterrows():
-                    d = str(row['date'])
-                    if len(d) == 8 and d.isdigit():
-                        d = f"{d[0:4]}-{d[4:6]}-{d[6:8]}"
-                    ohlcv.append({
-                        'date': d,
-                        'open': float(row['open']),
-                        'high': float(row['high']),
-                        'low': float(row['low']),
-                        'close': float(row['close']),
-                        'volume': float(row['volume']) if 'volume' in row else None,
-                    })
-
-            # Convert advanced indicators to JSON-safe
-            def _to_safe_list(arr):
-                safe = []
-                for x in arr:
-                    if isinstance(x, float) and (x != x):  # NaN -> None
-                        safe.append(None)
-                    else:
-                        safe.append(x)
-                return safe
-
-            adv_raw = getattr(analyzer, 'extra_indicators', {}) or {}
-            adv_safe = {}
-            for k, v in adv_raw.items():
-                if isinstance(v, np.ndarray):
-                    adv_safe[k] = _to_safe_list(v.tolist())
-                elif isinstance(v, (list, tuple)):
-                    adv_safe[k] = _to_safe_list(v)
-                else:
-                    adv_safe[k] = v
-
-            result = {
-                'stock_info': analyzer.stock_info,
-                'price_info': analyzer.get_price_info(),
-                'key_indicators': analyzer.get_key_indicators(),
-                'ma_levels': analyzer.get_ma_levels(),
-                'patterns': analyzer.patterns,
-                'signals': analyzer.signals,
-                'comprehensive_score': analyzer.综合评分,
-                'advanced_indicators': adv_safe,
-                'ohlcv': ohlcv,
-            }
-            
-            # Clean all NaN/Infinity values before JSON serialization
-            result = _clean_nan_values(result)
-            return jsonify(result)
-        except Exception as e:
-            import traceback
-            traceback.print_exc()
-            return jsonify({'error': 'Serialization Error', 'details': str(e)}), 500
+        payload, status = _analyze_one(symbol, period, _history_days(period))
+        if status != 200:
+            return jsonify(payload), status
+        return _json(payload)
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/analyze_batch', methods=['POST'])
+def analyze_batch():
+    """Analyze several symbols concurrently; per-symbol failures are returned inline as {'error': ...}."""
+    try:
+        data = request.get_json(force=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        raw = data.get('symbols') or []
+        if not isinstance(raw, list) or not all(isinstance(s, str) for s in raw):
+            return jsonify({'error': "'symbols' must be a list of strings"}), 400
+        period = data.get('period') or 'daily'
+        if not isinstance(period, str):
+            return jsonify({'error': "'period' must be a string"}), 400
+        symbols = list(dict.fromkeys(s.strip().upper() for s in raw if s.strip()))  # drop blanks and duplicates
+        period = period.strip()
+
+        if not symbols:
+            return jsonify({'error': 'Please enter at least one stock symbol'}), 400
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            return jsonify({'error': f'At most {MAX_BATCH_SYMBOLS} symbols per batch'}), 400
+
+        days = _history_days(period)
+        results = {}
+        # Fetching is network-bound and the indicator work runs in TA-Lib/Numba
+        # without the GIL, so threads overlap well here
+        with ThreadPoolExecutor(max_workers=min(BATCH_WORKERS, len(symbols))) as ex:
+            futures = {ex.submit(_analyze_one, sym, period, days): sym for sym in symbols}
+            for fut in as_completed(futures):
+                sym = futures[fut]
+                try:
+                    results[sym] = fut.result()[0]
+                except Exception as e:  # one failing symbol does not fail the batch
+                    results[sym] = {'error': str(e)}
+        return _json({'results': {sym: results[sym] for sym in symbols}})
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -139,10 +292,19 @@ def analyze():
 @app.route('/stock_list')
 def stock_list():
     try:
+        with _stock_list_lock:
+            if _stock_list_cache['data'] is not None and time.time() - _stock_list_cache['ts'] < STOCK_LIST_TTL:
+                return _json(_stock_list_cache['data'])
+
         from data_fetcher import DataFetcher
         fetcher = DataFetcher(use_proxy=True)
         stocks = fetcher.get_stock_list()
-        return jsonify(stocks.to_dict('records')[:100])
+        # Only the served rows are converted, not the whole listing
+        data = stocks.head(STOCK_LIST_SIZE).to_dict('records')
+        if data:  # an empty list means the fetch failed; retry on the next hit
+            with _stock_list_lock:
+                _stock_list_cache.update(ts=time.time(), data=data)
+        return _json(data)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -152,17 +314,31 @@ def health():
     return jsonify({'status': 'ok'})
 
 
-def _to_datetime_index(df):
+def _to_datetime_index(dates):
+    """DatetimeIndex named 'Date' (as mplfinance expects) from the data's date column."""
     import pandas as pd
     import numpy as np
-    data = df.copy()
-    if not np.issubdtype(data['date'].dtype, np.datetime64):
-        data['date'] = data['date'].astype(str).apply(
-            lambda d: datetime.strptime(d, '%Y%m%d') if d.isdigit() and len(d) == 8 else pd.to_datetime(d)
-        )
-    data = data.set_index('date')
-    data.index.name = 'Date'
-    return data
+    if not np.issubdtype(dates.dtype, np.datetime64):
+        # One vectorized parse for YYYYMMDD; anything else (e.g. YYYY-MM-DD) goes
+        # through the general parser
+        s = dates.astype(str)
+        parsed = pd.to_datetime(s, format='%Y%m%d', errors='coerce')
+        rest = parsed.isna()
+        if rest.any():
+            parsed[rest] = pd.to_datetime(s[rest])
+        dates = parsed
+    return pd.DatetimeIndex(dates, name='Date')
+
+
+def _to_safe_list(arr):
+    """ndarray -> list with NaN/Infinity as None (one vectorized isfinite pass)."""
+    import numpy as np
+    a = np.asarray(arr)
+    if a.dtype.kind != 'f':
+        return a.tolist()
+    out = a.astype(object)
+    out[~np.isfinite(a)] = None
+    return out.tolist()
 
 
 def _clean_nan_values(obj):
@@ -172,7 +348,7 @@ def _clean_nan_values(obj):
     
     if isinstance(obj, dict):
         return {k: _clean_nan_values(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
+    elif isinstance(obj, (list, tuple)):
         return [_clean_nan_values(item) for item in obj]
     elif isinstance(obj, float):
         if math.isnan(obj) or math.isinf(obj):
@@ -187,29 +363,70 @@ def _clean_nan_values(obj):
     elif isinstance(obj, np.bool_):
         return bool(obj)
     elif isinstance(obj, np.ndarray):
-         return _clean_nan_values(obj.tolist())
+        return _to_safe_list(obj) if obj.ndim == 1 else _clean_nan_values(obj.tolist())
     else:
         return obj
 
 
-def _generate_chart_png(analyzer, png_path: str):
+@functools.lru_cache(maxsize=1)
+def _ensure_report():
+    """Import mplfinance/reportlab on the first export only; API-only processes never load matplotlib."""
+    global mpf, canvas, A4, cm, ImageReader
     if not HAVE_REPORT:
+        return False
+    try:
+        # Headless, file-only rendering: select Agg before mplfinance pulls in
+        # pyplot, so no GUI backend is probed and renders are safe from any thread
+        import matplotlib
+        matplotlib.use('Agg')
+        import mplfinance as mpf
+        from reportlab.pdfgen import canvas
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import cm
+        from reportlab.lib.utils import ImageReader
+    except ImportError as e:
+        print(f"[!] PDF export unavailable: {e}")
+        return False
+    return True
+
+
+@functools.lru_cache(maxsize=1)
+def _mpf_style():
+    # Configure Chinese font style
+    # Use a style that supports Chinese (SimHei); built once and reused by every export
+    return mpf.make_mpf_style(base_mpf_style='yahoo', rc={'font.family': CHINESE_FONT, 'axes.unicode_minus': False})
+
+
+def _generate_chart_png(analyzer) -> bytes:
+    if not _ensure_report():
         raise RuntimeError('reportlab/mplfinance not installed, cannot export PDF')
 
+    import numpy as np
     import pandas as pd
+    import talib
 
-    df = analyzer.data.copy()
-    df = _to_datetime_index(df)
+    # Build the chart frame straight from the OHLCV columns (no copy of the full
+    # analysis frame); float32 is plenty for plotting
+    src = analyzer.data
     cols_map = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
-    for k, v in cols_map.items():
-        if k in df.columns:
-            df[v] = df[k].astype(float)
+    df = pd.DataFrame(
+        {v: src[k].to_numpy(dtype=np.float32) for k, v in cols_map.items() if k in src.columns},
+        index=_to_datetime_index(src['date']),
+    )
     df = df[['Open', 'High', 'Low', 'Close', 'Volume']].dropna()
 
     add_plots = []
-    # MA20 & MA60
-    df['MA20'] = df['Close'].rolling(window=20).mean()
-    df['MA60'] = df['Close'].rolling(window=60).mean()
+    # MA20 & MA60: reuse the SMAs computed during analyze(); recompute (TA-Lib's
+    # C SMA) only when dropna() removed rows and they no longer line up
+    ind = getattr(analyzer, 'indicators', None) or {}
+    close = None
+    for col, key, window in (('MA20', 'SMA_20', 20), ('MA60', 'SMA_60', 60)):
+        sma = ind.get(key)
+        if sma is None or len(sma) != len(df):
+            if close is None:
+                close = df['Close'].to_numpy(dtype=np.float64)
+            sma = talib.SMA(close, timeperiod=window)
+        df[col] = pd.Series(sma, index=df.index)
     add_plots.append(mpf.make_addplot(df['MA20'], color='#2f7df6', width=1.2))
     add_plots.append(mpf.make_addplot(df['MA60'], color='#ffb703', width=1.2))
 
@@ -229,26 +446,27 @@ def _generate_chart_png(analyzer, png_path: str):
         add_plots.append(mpf.make_addplot(df['SenkouA'], color='#8bc34a', width=0.8, linestyle='--'))
         add_plots.append(mpf.make_addplot(df['SenkouB'], color='#e57373', width=0.8, linestyle='--'))
 
-    # Configure Chinese font style
-    # Use a style that supports Chinese (SimHei)
-    my_style = mpf.make_mpf_style(base_mpf_style='yahoo', rc={'font.family': CHINESE_FONT, 'axes.unicode_minus': False})
-
+    # Rendered in memory; the PDF embeds it straight from the buffer
+    buf = io.BytesIO()
     mpf.plot(
         df,
         type='candle',
-        style=my_style,
+        style=_mpf_style(),
         addplot=add_plots,
         volume=True,
         mav=(),
-        savefig=dict(fname=png_path, dpi=160, bbox_inches='tight')
+        figsize=CHART_FIGSIZE,
+        savefig=dict(fname=buf, format='png', dpi=CHART_DPI)
     )
+    return buf.getvalue()
 
 
-def _generate_pdf_report(analyzer, pdf_path: str, chart_png_path: str):
-    if not HAVE_REPORT:
+def _generate_pdf_report(analyzer, chart_png: bytes = None) -> bytes:
+    if not _ensure_report():
         raise RuntimeError('reportlab not installed, cannot export PDF')
 
-    c = canvas.Canvas(pdf_path, pagesize=A4)
+    buf = io.BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
     w, h = A4
     margin = 2 * cm
     y = h - margin
@@ -290,10 +508,10 @@ def _generate_pdf_report(analyzer, pdf_path: str, chart_png_path: str):
     for line in lines:
         c.drawString(margin, yy, line); yy -= 0.8 * cm
 
-    if os.path.exists(chart_png_path):
+    if chart_png:
         img_w = w - 2 * margin
         img_h = img_w * 0.55
-        c.drawImage(chart_png_path, margin, margin + 3 * cm, width=img_w, height=img_h, preserveAspectRatio=True)
+        c.drawImage(ImageReader(io.BytesIO(chart_png)), margin, margin + 3 * cm, width=img_w, height=img_h, preserveAspectRatio=True)
     c.showPage()
 
     # Signals
@@ -315,6 +533,7 @@ def _generate_pdf_report(analyzer, pdf_path: str, chart_png_path: str):
             c.showPage(); yy = h - margin
 
     c.showPage(); c.save()
+    return buf.getvalue()
 
 
 # @app.route('/export_pdf')
@@ -323,7 +542,7 @@ def _generate_pdf_report(analyzer, pdf_path: str, chart_png_path: str):
 #     if not symbol:
 #         return jsonify({'error': 'missing symbol'}), 400
 
-#     if not HAVE_REPORT:
+#     if not _ensure_report():
 #         return jsonify({'error': 'reportlab/mplfinance not available on server'}), 500
 
 #     try:
@@ -335,23 +554,18 @@ def _generate_pdf_report(analyzer, pdf_path: str, chart_png_path: str):
 #     if not analyzer.analyze(symbol, days=120):
 #         return jsonify({'error': 'analysis failed, check symbol or network'}), 400
 
-#     # Use temporary directory for Vercel/Cloud compatibility
-#     with tempfile.TemporaryDirectory() as tmpdirname:
-#         ts = datetime.now().strftime('%Y%m%d_%H%M%S')
-#         base = f"{symbol}_{ts}"
-#         chart_path = os.path.join(tmpdirname, f"{base}_chart.png")
-#         pdf_path = os.path.join(tmpdirname, f"{base}_report.pdf")
-
-#         try:
-#             _generate_chart_png(analyzer, chart_path)
-#             _generate_pdf_report(analyzer, pdf_path, chart_path)
-
-#             # Read file into memory to serve it
-#             return send_file(pdf_path, as_attachment=True, download_name=f"{base}_report.pdf")
-#         except Exception as e:
-#             import traceback
-#             traceback.print_exc()
-#             return jsonify({'error': f'PDF Generation Error: {str(e)}'}), 500
+#     # Rendered entirely in memory (no temp files, Vercel/Cloud compatible)
+#     ts = datetime.now().strftime('%Y%m%d_%H%M%S')
+#     base = f"{symbol}_{ts}"
+#     try:
+#         chart_png = _generate_chart_png(analyzer)
+#         pdf = _generate_pdf_report(analyzer, chart_png)
+#         return send_file(io.BytesIO(pdf), mimetype='application/pdf',
+#                          as_attachment=True, download_name=f"{base}_report.pdf")
+#     except Exception as e:
+#         import traceback
+#         traceback.print_exc()
+#         return jsonify({'error': f'PDF Generation Error: {str(e)}'}), 500
 
 
 if __name__ == '__main__':
@@ -360,4 +574,4 @@ if __name__ == '__main__':
     print("  Visit: http://localhost:5000")
     print("=" * 60 + "\n")
     port = int(os.environ.get('PORT', 5000))
-    app.run(debug=True, use_reloader=False, threaded=False, host='0.0.0.0', port=port)
\ No newline at end of file
+    app.run(debug=True, use_reloader=False, threaded=True, host='0.0.0.0', port=port)
\ No newline at end of file